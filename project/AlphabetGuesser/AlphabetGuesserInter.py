@@ -143,7 +143,7 @@ class AlphabetGuesserInter(tk.Frame):
             return str(number) + 'th'
 
     def restart_letter_guesser(self):
-        self.letter_guesser.__init__()
+        self.letter_guesser.restart()
         self.update_current_asked_word()
         self.__letter_found = False
 
@@ -0,0 +1,129 @@
+import numpy as np
+
+ALPHABET = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q',
+            'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', '0', '1', '2', '3', '4', '5', '6', '7',
+            '8', '9', '@', '.', '-', ' ', '?', '!']
+FULL_MASK = (1 << len(ALPHABET)) - 1
+
+# Number of set bits for every possible byte; used to popcount a whole mask array at once.
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def phrase_mask(phrase: str) -> int:
+    """
+    Returns the character mask of a phrase; bit i is set when ALPHABET[i] is in the phrase.
+    Characters that are not part of ALPHABET are ignored.
+    :param phrase: The word/phrase to convert
+    :return: The mask as an int
+    """
+    mask = 0
+    for bit, character in enumerate(ALPHABET):
+        if character in phrase:
+            mask |= 1 << bit
+    return mask
+
+
+def mask_to_characters(mask: int) -> list:
+    """
+    Returns the characters contained in a mask, in the order of ALPHABET
+    :param mask: The mask to convert
+    :return: List of characters
+    """
+    return [character for bit, character in enumerate(ALPHABET) if mask >> bit & 1]
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """
+    Counts the set bits of every mask in a uint64 array
+    :param masks: Array of uint64 masks
+    :return: Array of the same length containing the number of set bits of each mask
+    """
+    masks = np.ascontiguousarray(masks, dtype=np.uint64)
+    return _POPCOUNT_TABLE[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+class CandidateEngine:
+    """
+    CandidateEngine:
+        Keeps track of the characters that are still possible and of the phrases that can still
+        tell them apart. Every phrase of the corpus is stored as a 42-bit character mask, so
+        answering a question only takes a few vectorized bitwise operations over the whole corpus.
+
+    === Public Attributes ===
+    corpus: The shared Corpus; it is never modified
+    phrases: Every phrase of the corpus
+    masks: uint64 array holding the character mask of every phrase
+    lengths: int array holding the length of every phrase
+    candidates: Mask of the characters that are still possible
+    alive: bool array; True for every phrase that can still be asked
+
+    === Methods ===
+    reset: Makes every character and phrase possible again
+    narrow: Removes the characters that don't match the user's answer, without pruning phrases
+    answer: Handles the user's answer for a given mask
+    prune: Removes the phrases that contain none or all of the possible characters
+    candidate_counts: Number of possible characters contained in each phrase
+    ratios: Percentage of each phrase made of possible characters
+    best_splits: Phrases that split the possible characters the closest to half
+    alive_indices: Indices of the phrases that can still be asked
+    """
+
+    def __init__(self, corpus) -> None:
+        self.corpus = corpus
+        self.phrases = corpus.phrases
+        self.masks = corpus.masks
+        self.lengths = corpus.lengths
+        self.candidates = FULL_MASK
+        self.alive = np.ones(len(corpus), dtype=bool)
+
+    def reset(self) -> None:
+        # alive is reset in place so that restarting a session doesn't allocate anything
+        self.candidates = FULL_MASK
+        self.alive[:] = True
+
+    def narrow(self, mask: int, answer: str) -> None:
+        """
+        Removes the characters that don't match the user's answer for a phrase with the given mask
+        :param mask: Character mask of the phrase the user answered for
+        :param answer: "Yes" or "No"; anything else is ignored
+        :return: None
+        """
+        if answer == "Yes":
+            self.candidates &= mask
+        elif answer == "No":
+            self.candidates &= ~mask & FULL_MASK
+
+    def answer(self, mask: int, answer: str) -> None:
+        self.narrow(mask, answer)
+        self.prune()
+
+    def prune(self) -> None:
+        candidates = np.uint64(self.candidates)
+        contained = self.masks & candidates
+        # A phrase only splits the candidates if it contains some, but not all, of them
+        self.alive &= (contained != 0) & (contained != candidates)
+
+    def candidate_counts(self, indices: np.ndarray) -> np.ndarray:
+        return popcount(self.masks[indices] & np.uint64(self.candidates))
+
+    def ratios(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the percentage of characters of each phrase that are still possible characters
+        :param indices: Indices of the phrases
+        :return: Array of percentages
+        """
+        return self.candidate_counts(indices) / self.lengths[indices] * 100
+
+    def best_splits(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the phrases whose answer splits the possible characters the closest to half;
+        whatever the answer is, these phrases remove the most characters in the worst case.
+        :param indices: Indices of the phrases to choose from
+        :return: Indices of all the phrases that are equally good
+        """
+        total = bin(self.candidates).count('1')
+        distances = np.abs(2 * self.candidate_counts(indices) - total)
+        return indices[distances == distances.min()]
+
+    def alive_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.alive)
@@ -0,0 +1,238 @@
+import hashlib
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+from functools import lru_cache
+import numpy as np
+from project.AlphabetGuesser.candidate_engine import phrase_mask
+
+"""
+Binary corpus format, all integers are little-endian:
+    header: magic b'LGCORPUS', version (uint32), reserved (uint32), phrase count n (uint64),
+        size of the string table in bytes (uint64)
+    masks: n uint64, the character mask of every phrase
+    offsets: n + 1 uint64, phrase i is string_table[offsets[i]:offsets[i + 1]]
+    string table: every phrase encoded in UTF-8, one after the other
+The header and both arrays are 8 bytes wide, so the arrays can be read in place from a mmap.
+"""
+CORPUS_MAGIC = b'LGCORPUS'
+CORPUS_VERSION = 1
+_HEADER = struct.Struct('<8sIIQQ')
+
+
+class PhraseTable:
+    """
+    PhraseTable:
+        Sequence of phrases backed by an offset-indexed string table; a phrase is only decoded
+        when it is accessed.
+
+    === Public Attributes ===
+    offsets: uint64 array, phrase i is string_table[offsets[i]:offsets[i + 1]]
+
+    === Methods ===
+    lengths: Returns the length in bytes of every phrase
+    """
+
+    def __init__(self, string_table, offsets: np.ndarray) -> None:
+        self.__string_table = string_table
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index) -> str:
+        if not -len(self) <= index < len(self):
+            raise IndexError('phrase index out of range')
+        index = int(index) % len(self)
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return str(self.__string_table[start:end], 'utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets).astype(np.int64)
+
+
+class Corpus:
+    """
+    Corpus:
+        Read-only collection of the words/phrases the letter guesser can ask about. A corpus is
+        loaded once per process with load_corpus and shared by every LetterGuesser, so it must
+        never be modified.
+
+    === Public Attributes ===
+    phrases: Sequence of every word/phrase
+    masks: Read-only uint64 array holding the character mask of every phrase
+    lengths: Read-only int array holding the length of every phrase; only computed when first used.
+        Phrases read from a corpus file are measured in UTF-8 bytes
+    """
+
+    def __init__(self, phrases, masks=None) -> None:
+        if not isinstance(phrases, PhraseTable):
+            phrases = tuple(phrases)
+        self.phrases = phrases
+        if masks is None:
+            masks = [phrase_mask(phrase) for phrase in self.phrases]
+        if not isinstance(masks, np.ndarray) or masks.flags.writeable:
+            masks = np.array(masks, dtype=np.uint64)
+            masks.flags.writeable = False
+        self.masks = masks
+        self.__lengths = None
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        if self.__lengths is None:
+            if isinstance(self.phrases, PhraseTable):
+                self.__lengths = self.phrases.lengths()
+            else:
+                self.__lengths = np.array([len(phrase) for phrase in self.phrases],
+                                          dtype=np.int64)
+            self.__lengths.flags.writeable = False
+        return self.__lengths
+
+
+class CorpusWriter:
+    """
+    CorpusWriter:
+        Writes a corpus file one batch of phrases at a time, so corpora that don't fit in memory can
+        be saved. The masks, offsets and string table are spooled to temporary files and assembled
+        when the writer is closed; the file is written next to path and then moved over it, so
+        corpora that are currently mapped by load_corpus are never modified.
+
+    === Public Attributes ===
+    path: Path of the corpus file
+    count: Number of phrases written so far
+    table_size: Size in bytes of the string table written so far
+
+    === Methods ===
+    append: Adds a batch of phrases
+    close: Assembles the corpus file
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self.count = 0
+        self.table_size = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        self.__masks = tempfile.TemporaryFile(dir=directory)
+        self.__offsets = tempfile.TemporaryFile(dir=directory)
+        self.__table = tempfile.TemporaryFile(dir=directory)
+        self.__offsets.write(np.zeros(1, dtype='<u8').tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.__discard()
+
+    def append(self, masks, lengths, table: bytes) -> None:
+        """
+        Adds a batch of phrases
+        :param masks: Character mask of every phrase of the batch
+        :param lengths: Length in bytes of every phrase of the batch
+        :param table: Every phrase of the batch encoded in UTF-8, one after the other
+        :return: None
+        """
+        offsets = self.table_size + np.cumsum(lengths, dtype=np.uint64)
+        self.__masks.write(np.asarray(masks, dtype='<u8').tobytes())
+        self.__offsets.write(offsets.astype('<u8').tobytes())
+        self.__table.write(table)
+        self.count += len(offsets)
+        self.table_size += len(table)
+
+    def close(self) -> None:
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'wb') as outfile:
+            outfile.write(_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, 0, self.count,
+                                       self.table_size))
+            for spool in [self.__masks, self.__offsets, self.__table]:
+                spool.seek(0)
+                shutil.copyfileobj(spool, outfile)
+        self.__discard()
+        os.replace(temporary_path, self.path)
+
+    def __discard(self) -> None:
+        for spool in [self.__masks, self.__offsets, self.__table]:
+            spool.close()
+
+
+def write_corpus(path, phrases, masks=None) -> None:
+    """
+    Saves phrases in the binary corpus format
+    :param path: Path of the corpus file
+    :param phrases: List of every word/phrase
+    :param masks: Character mask of every phrase; computed from the phrases if None
+    :return: None
+    """
+    if masks is None:
+        masks = [phrase_mask(phrase) for phrase in phrases]
+    encoded = [phrase.encode('utf-8') for phrase in phrases]
+    with CorpusWriter(path) as writer:
+        writer.append(masks, [len(phrase) for phrase in encoded], b''.join(encoded))
+
+
+def open_corpus(path) -> Corpus:
+    """
+    Maps a corpus file created by write_corpus in memory. The masks and offsets are read in place
+        and phrases are only decoded when they are accessed, so opening a corpus costs the same
+        whatever its size.
+    :param path: Path of the corpus file
+    :return: The Corpus
+    """
+    with open(path, 'rb') as infile:
+        buffer = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _, count, table_size = _HEADER.unpack_from(buffer)
+    if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+        raise ValueError('{} is not a version {} corpus file'.format(path, CORPUS_VERSION))
+
+    masks_start = _HEADER.size
+    offsets_start = masks_start + count * 8
+    table_start = offsets_start + (count + 1) * 8
+    masks = np.frombuffer(buffer, dtype='<u8', count=count, offset=masks_start)
+    offsets = np.frombuffer(buffer, dtype='<u8', count=count + 1, offset=offsets_start)
+    string_table = memoryview(buffer)[table_start:table_start + table_size]
+    return Corpus(PhraseTable(string_table, offsets), masks)
+
+
+@lru_cache(maxsize=None)
+def load_corpus(path="project/AlphabetGuesser/words_corpus") -> Corpus:
+    """
+    Loads the corpus created by create_dictionary; the file is only mapped the first time a
+        given path is loaded, every later call returns the same Corpus
+    :param path: Path of the corpus file
+    :return: The shared Corpus
+    """
+    return open_corpus(path)
+
+
+@lru_cache(maxsize=None)
+def corpus_digest(corpus: Corpus) -> str:
+    """
+    Hashes the masks of a corpus once per Corpus, so that an opening book can tell whether it was
+        built for it
+    :param corpus: The corpus
+    :return: The hex digest of the hash
+    """
+    return hashlib.sha256(np.ascontiguousarray(corpus.masks).tobytes()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_opening_book(path="project/AlphabetGuesser/opening_book"):
+    """
+    Loads the book created by create_opening_book once per process
+    :param path: Path of the opening book pickle
+    :return: The shared opening book
+    """
+    with open(path, 'rb') as infile:
+        return pickle.load(infile)
@@ -1,30 +1,112 @@
-import pickle
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from project.AlphabetGuesser.candidate_engine import ALPHABET
+from project.AlphabetGuesser.corpus import CorpusWriter
 
+NEWLINE = ord('\n')
 
-def create_dictionary() -> None:
+# Mask bit of every byte value; 0 for the bytes that are not in ALPHABET. Every character of
+# ALPHABET is ASCII, so testing the UTF-8 bytes of a phrase gives the same result as its characters.
+BYTE_MASKS = np.zeros(256, dtype=np.uint64)
+for _bit, _character in enumerate(ALPHABET):
+    BYTE_MASKS[ord(_character)] = np.uint64(1 << _bit)
+
+
+def read_chunks(path, chunk_size):
+    """
+    Reads a file with the format of words.txt in chunks of about chunk_size bytes; each chunk only
+        contains whole lines and always ends with a newline
+    :param path: Path of the file
+    :param chunk_size: Number of bytes read at once
+    :return: Generator of chunks
+    """
+    with open(path, 'rb') as infile:
+        remainder = b''
+        while True:
+            data = infile.read(chunk_size)
+            if len(data) == 0:
+                break
+            data = remainder + data
+            end = data.rfind(b'\n') + 1
+            remainder = data[end:]
+            if end > 0:
+                yield data[:end]
+        if len(remainder) > 0:
+            yield remainder + b'\n'
+
+
+def chunk_masks(chunk: bytes):
+    """
+    Determines what letters comprise each line of a chunk with vectorized byte operations
+    :param chunk: Whole lines, each of them ending with a newline
+    :return: Tuple of the character mask of each line, the length in bytes of each line and the
+        lines without their newlines, one after the other
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    newlines = np.flatnonzero(data == NEWLINE)
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    # Every line is reduced together with its newline, whose mask is 0, so empty lines get 0 too
+    masks = np.bitwise_or.reduceat(BYTE_MASKS[data], starts)
+    lengths = newlines - starts
+    return masks, lengths, data[data != NEWLINE].tobytes()
+
+
+def create_dictionary(source="project/AlphabetGuesser/words.txt",
+                      destination="project/AlphabetGuesser/words_corpus",
+                      workers=None, chunk_size=1 << 24, verbose=False) -> None:
     """
     Reads each word from a file with the format of words.txt & determines what letters comprise each
-        word; saved into a dictionary in the following format:
-        {'apple': [a, e, l, p], 'banana': [a, b, n], ...etc}
-        Finally, the created dictionary is saved as a pickle
+        word as a character mask, bit i being set when ALPHABET[i] is in the word:
+        'apple' -> a, e, l, p, 'banana' -> a, b, n, ...etc
+        The words and their masks are saved in the binary corpus format (see corpus.py).
+        The file is streamed in chunks that are spread across a process pool, so it doesn't need to
+        fit in memory.
+    :param source: Path of the words file
+    :param destination: Path of the corpus file
+    :param workers: Number of worker processes; defaults to the number of CPUs. Files smaller than a
+        single chunk are always read in this process
+    :param chunk_size: Number of bytes given to a worker at once
+    :param verbose: Prints the throughput of the build if True
     :return: None
     """
-    dictionary = {}
-    alphabet = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q',
-                'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z', '0', '1', '2', '3', '4', '5', '6', '7',
-                '8', '9', '@', '.', '-', ' ', '?', '!']
-    with open('project/Alphabetguesser/words.txt') as f:
-        for word in f:
-            word = word[:len(word) - 1]
-            letters = []
-            for letter in alphabet:
-                if letter in word:
-                    letters.append(letter)
-            dictionary[word] = letters
-        f.close()
-    with open("project/AlphabetGuesser/words_pickle", 'wb') as outfile:
-        pickle.dump(dictionary, outfile)
+    start_time = time.perf_counter()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if os.path.getsize(source) <= chunk_size:
+        workers = 1
+
+    with CorpusWriter(destination) as writer:
+        if workers == 1:
+            for chunk in read_chunks(source, chunk_size):
+                writer.append(*chunk_masks(chunk))
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                # Only a few chunks are in flight at once and they are written back in order
+                pending = deque()
+                for chunk in read_chunks(source, chunk_size):
+                    pending.append(executor.submit(chunk_masks, chunk))
+                    if len(pending) >= 2 * workers:
+                        writer.append(*pending.popleft().result())
+                while len(pending) > 0:
+                    writer.append(*pending.popleft().result())
+        count, size = writer.count, os.path.getsize(source)
+
+    if verbose:
+        elapsed = time.perf_counter() - start_time
+        print('Built {} phrases from {:.1f} MB in {:.2f}s: {:.1f} MB/s, {:.0f} phrases/s'
+              .format(count, size / 1e6, elapsed, size / 1e6 / elapsed, count / elapsed))
 
 
 if __name__ == '__main__':
-    create_dictionary()
+    parser = argparse.ArgumentParser(description="Builds the letter guesser's corpus")
+    parser.add_argument('source', nargs='?', default="project/AlphabetGuesser/words.txt")
+    parser.add_argument('destination', nargs='?', default="project/AlphabetGuesser/words_corpus")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1 << 24)
+    arguments = parser.parse_args()
+    create_dictionary(arguments.source, arguments.destination, arguments.workers,
+                      arguments.chunk_size, verbose=True)
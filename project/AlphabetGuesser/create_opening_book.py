@@ -0,0 +1,89 @@
+import argparse
+import pickle
+import random
+import time
+from collections import deque
+import numpy as np
+from project.AlphabetGuesser.candidate_engine import CandidateEngine, FULL_MASK
+from project.AlphabetGuesser.corpus import corpus_digest, open_corpus
+
+"""
+Builds the opening book of the letter guesser. It is an offline step, run after the corpus changes:
+    python -m project.AlphabetGuesser.create_opening_book
+A book built for another corpus is ignored by LetterGuesser, which then asks its questions with the
+candidate engine alone.
+"""
+# Number of questions the book covers from the full alphabet
+MAX_DEPTH = 6
+# Largest number of nodes; each one prunes the whole corpus once while the book is built
+MAX_NODES = 1000
+MAX_CHOICES = 16
+
+
+def create_opening_book(source="project/AlphabetGuesser/words_corpus",
+                        destination="project/AlphabetGuesser/opening_book", max_depth=MAX_DEPTH,
+                        max_nodes=MAX_NODES, max_choices=MAX_CHOICES, seed=0) -> int:
+    """
+    Reads the corpus created by create_dictionary & precomputes the first questions the "split"
+        policy of LetterGuesser can ask, starting from the full alphabet. The nodes are visited
+        breadth first, so the book holds every node of the first questions until max_depth or
+        max_nodes is reached. The book is saved as a pickle in the following format:
+        {'corpus': corpus_digest of the corpus,
+         'nodes': {possible characters mask: int array of the indices of the best phrases}}
+        The answer to a phrase leads to the node (mask & phrase mask) for "Yes" or
+        (mask & ~phrase mask) for "No". Phrases are only stored as indices in the corpus.
+    :param source: Path of the corpus file
+    :param destination: Path of the book
+    :param max_depth: Number of questions after which nodes aren't added anymore
+    :param max_nodes: Maximum number of nodes
+    :param max_choices: Maximum number of equally good phrases kept for each node; the phrases
+        that are kept are picked at random
+    :param seed: Seed of the phrases that are kept; the same corpus & seed give the same book
+    :return: Number of nodes
+    """
+    corpus = open_corpus(source)
+    engine = CandidateEngine(corpus)
+    rng = random.Random(seed)
+
+    nodes = {}
+    to_visit = deque([(FULL_MASK, 0)])
+    while len(to_visit) > 0 and len(nodes) < max_nodes:
+        candidates, depth = to_visit.popleft()
+        # Nodes with a single character left are leaves; the character has been found
+        if candidates in nodes or bin(candidates).count('1') <= 1:
+            continue
+        engine.candidates = candidates
+        engine.alive[:] = True
+        engine.prune()
+        indices = engine.alive_indices()
+        if len(indices) == 0:
+            continue
+        best = engine.best_splits(indices)
+        if len(best) > max_choices:
+            best = np.array(rng.sample(best.tolist(), max_choices))
+        nodes[candidates] = best.astype(np.int32)
+        if depth + 1 < max_depth:
+            for index in best.tolist():
+                mask = int(engine.masks[index])
+                to_visit.append((candidates & mask, depth + 1))
+                to_visit.append((candidates & ~mask & FULL_MASK, depth + 1))
+
+    book = {'corpus': corpus_digest(corpus), 'nodes': nodes}
+    with open(destination, 'wb') as outfile:
+        pickle.dump(book, outfile)
+    return len(nodes)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Builds the opening book of the letter guesser")
+    parser.add_argument('source', nargs='?', default="project/AlphabetGuesser/words_corpus")
+    parser.add_argument('destination', nargs='?', default="project/AlphabetGuesser/opening_book")
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+    parser.add_argument('--max-nodes', type=int, default=MAX_NODES)
+    parser.add_argument('--max-choices', type=int, default=MAX_CHOICES)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+    start = time.perf_counter()
+    count = create_opening_book(arguments.source, arguments.destination, arguments.max_depth,
+                                arguments.max_nodes, arguments.max_choices, arguments.seed)
+    print("Built {} nodes in {:.2f}s".format(count, time.perf_counter() - start))
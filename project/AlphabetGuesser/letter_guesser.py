@@ -1,31 +1,59 @@
-import pickle
+import os
 import random
+from project.AlphabetGuesser.candidate_engine import CandidateEngine, mask_to_characters, \
+    phrase_mask
+from project.AlphabetGuesser.corpus import corpus_digest, load_corpus, load_opening_book
 
 
 class LetterGuesser:
     """
     LetterGuesser:
+        Guesses the character the user is thinking of by asking whether it is in words/phrases of
+        the corpus. Each answer narrows the possible characters & prunes the words/phrases that
+        can't tell the remaining ones apart.
 
     === Public Attributes ===
-    dictionary
-    possible_characters
-
-    === Methods === request_word: returns a random word from the dictionary
-    remove_possible_letters: removes all characters from possible_characters that are not
-        contained in the given word/phrase remove_possible_words: removes all words/phrases from
-        dictionary that contain none of the characters in the given word/phrase
-    contains_none_letters: Returns True only if none the letters in word_2 are contained in  word_1
-    answer: Handles the user's answer of either "Yes" or "No"
+    corpus: Corpus shared by every LetterGuesser of the process, unless another one is given; it
+        is never modified
+    possible_characters: The characters that are still possible, in the order of the alphabet
+    policy: How request_word picks the next word/phrase:
+        "split": one of the words/phrases closest to splitting possible_characters in half
+        "random": a random word/phrase mostly made of possible characters
+    engine: CandidateEngine keeping track of the possible characters & words/phrases of this
+        session
+    opening_book: Precomputed questions of the "split" policy, created by create_opening_book;
+        None if there is no book, if it was built for another corpus or if another policy is used
+
+    === Methods ===
+    request_word: Returns the next word/phrase to ask about; while the possible characters are
+        in the opening book, one of its phrases is picked at random, otherwise a word/phrase is
+        picked with the policy among the ones that are still useful
+    answer: Handles the user's answer of either "Yes" or "No"; only the possible characters are
+        narrowed while the opening book is used, the words/phrases are pruned once it is left
+    restart: Starts guessing a new character
+    words_left: Returns the number of words/phrases that can still be asked
+    remove_possible_letters: Removes the characters that the answer about a word/phrase rules out
+    remove_possible_words: Removes the words/phrases that can't split the possible characters
+    find_ratio_of_remaining_letter_in_word: Returns the percentage of the characters of a word that
+        are still possible
+    contains_none_letters: Returns True only if none the letters in word_1 are contained in word_2
+    contains_all_letters: Returns True only if all the letters in word_1 are contained in word_2
     """
-    def __init__(self):
-        self.dictionary = None
-        self.possible_characters = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
-                                    'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z',
-                                    '0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '@', '.', '-',
-                                    ' ', '?', '!']
-        with open("project/alphabetguesser/words_pickle", "rb") as openfile:
-            self.dictionary = pickle.load(openfile)
-            openfile.close()
+    def __init__(self, policy="split", corpus=None):
+        self.policy = policy
+        self.corpus = load_corpus() if corpus is None else corpus
+        self.engine = CandidateEngine(self.corpus)
+        self.opening_book = None
+        # The opening book only holds phrases of the default corpus
+        if policy == "split" and corpus is None and \
+                os.path.exists("project/AlphabetGuesser/opening_book"):
+            book = load_opening_book()
+            if book.get('corpus') == corpus_digest(self.corpus):
+                self.opening_book = book
+
+    @property
+    def possible_characters(self) -> list:
+        return mask_to_characters(self.engine.candidates)
 
     def answer(self, requested_word, answer):
         """
@@ -35,44 +63,44 @@ class LetterGuesser:
             anything else
         :return: None
         """
-        self.remove_possible_letters(requested_word, answer)
-        self.remove_possible_words()
+        if self.opening_book is not None:
+            # The phrases are only pruned if we leave the book
+            self.engine.narrow(phrase_mask(requested_word), answer)
+        else:
+            self.engine.answer(phrase_mask(requested_word), answer)
+
+    def restart(self) -> None:
+        """
+        Makes every character possible again; the corpus is neither reloaded nor copied
+        :return: None
+        """
+        self.engine.reset()
 
     def request_word(self) -> str:
-        words = list(self.dictionary.keys())
-        random.shuffle(words)
-        for word in words:
-            if self.find_ratio_of_remaining_letter_in_word(word) > 30:
-                return word
-        return random.choice(words)
+        if self.opening_book is not None and self.engine.candidates in self.opening_book['nodes']:
+            choices = self.opening_book['nodes'][self.engine.candidates]
+            return self.engine.phrases[random.choice(choices)]
+        self.engine.prune()
+        indices = self.engine.alive_indices()
+        if self.policy == "split" and len(indices) > 0:
+            return self.engine.phrases[random.choice(self.engine.best_splits(indices))]
+        eligible = indices[self.engine.ratios(indices) > 30]
+        if len(eligible) > 0:
+            return self.engine.phrases[random.choice(eligible)]
+        return self.engine.phrases[random.choice(indices)]
 
     def remove_possible_letters(self, word, answer) -> None:
-        characters_to_delete = []
-        for character in self.possible_characters:
-            if character not in word and answer == "Yes":
-                characters_to_delete.append(character)
-            elif character in word and answer == "No":
-                characters_to_delete.append(character)
-        for character in characters_to_delete:
-            self.possible_characters.remove(character)
+        self.engine.narrow(phrase_mask(word), answer)
 
     def remove_possible_words(self) -> None:
-        words_to_delete = []
-        for elem in self.dictionary:
-            if self.contains_none_letters(elem, self.possible_characters) or \
-                    self.contains_all_letters(self.possible_characters, elem):
-                words_to_delete.append(elem)
-            # if a word contains none of the possible letters, remove it
-        for elem in words_to_delete:
-            del self.dictionary[elem]
+        self.engine.prune()
 
-    def find_ratio_of_remaining_letter_in_word(self, word):
-        i = 0
-        for letter in self.possible_characters:
-            if letter in word:
-                i += 1
+    def words_left(self) -> int:
+        self.engine.prune()
+        return int(self.engine.alive.sum())
 
-        return i/len(word)*100
+    def find_ratio_of_remaining_letter_in_word(self, word):
+        return bin(phrase_mask(word) & self.engine.candidates).count('1') / len(word) * 100
 
     @staticmethod
     def contains_none_letters(word_1, word_2) -> bool:
@@ -106,7 +134,7 @@ if __name__ == '__main__':
         question_num += 1
         guesser.answer(word, yes_no)
         print('Possible characters:', guesser.possible_characters)
-        print('Words left to pick from:', len(list(guesser.dictionary)))
+        print('Words left to pick from:', guesser.words_left())
         if len(guesser.possible_characters) == 1:
             print('The character you want is \'{0}\''.format(guesser.possible_characters[0]))
             break
@@ -0,0 +1,84 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from project.contact import Contact
+from project.create_contact_list_pickle import generate_random_phone_number, \
+    generate_random_address, generate_note
+
+"""
+Measures the memory taken by the Contact objects, in bytes per contact. The names & values are
+made before the measurement starts, so only the contacts, their collections & the dictionary
+holding them are counted. Every field is filled half of the time, as in create_contact_list_pickle.
+    python -m project.Benchmarks.contact_memory
+"""
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def make_values(count: int, seed=0) -> tuple:
+    """
+    Makes the names & a pool of values to fill the contacts with
+    :param count: Number of names
+    :param seed: Seed of the random values
+    :return: (names, phone numbers, addresses, emails, notes)
+    """
+    random.seed(seed)
+    names = ['Contact {}'.format(i) for i in range(count)]
+    phone_numbers = [generate_random_phone_number() for _ in range(1000)]
+    addresses = [generate_random_address() for _ in range(1000)]
+    emails = ['contact.{}@gmail.com'.format(i) for i in range(1000)]
+    notes = [generate_note() for _ in range(1000)]
+    return names, phone_numbers, addresses, emails, notes
+
+
+def fill(contact: Contact, values: tuple, rng: random.Random) -> None:
+    _, phone_numbers, addresses, emails, notes = values
+    if rng.random() < 0.5:
+        contact.addresses.append(rng.choice(addresses))
+    if rng.random() < 0.5:
+        contact.email_addresses.append(rng.choice(emails))
+    for num_type in ['Home', 'Work', 'Personal']:
+        if rng.random() < 0.5:
+            contact.append_phone_number(num_type, rng.choice(phone_numbers))
+    if rng.random() < 0.5:
+        contact.notes.append(rng.choice(notes))
+
+
+def bytes_per_contact(count: int, filled=True, seed=0) -> float:
+    """
+    Measures the memory taken by count contacts
+    :param count: Number of contacts
+    :param filled: Fills the contacts like create_contact_list_pickle if True, else leaves them
+        empty
+    :param seed: Seed of the random values
+    :return: Bytes per contact
+    """
+    values = make_values(count, seed)
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    contacts = {}
+    for name in values[0]:
+        contact = Contact(name)
+        if filled:
+            fill(contact, values, rng)
+        contacts[name] = contact
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the memory used per contact")
+    parser.add_argument('sizes', nargs='*', type=int, default=SIZES)
+    args = parser.parse_args()
+
+    print("{:>10} {:>14} {:>14}".format("contacts", "empty (B)", "filled (B)"))
+    for count in args.sizes:
+        print("{:>10} {:>14.1f} {:>14.1f}".format(count, bytes_per_contact(count, filled=False),
+                                                  bytes_per_contact(count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from project.AlphabetGuesser.corpus import open_corpus
+from project.AlphabetGuesser.create_dictionary import create_dictionary
+from project.AlphabetGuesser.letter_guesser import LetterGuesser
+from project.ContactBook.contact_book import ContactBook
+from project.ContactBook.contact_service import ContactService
+from project.ContactBook.journal_store import JournalStore
+from project.create_contact_list_pickle import generate_contacts, write_contacts
+
+"""
+Times the hot paths of the app at 1k, 10k, 100k & 1M contacts or phrases, and compares them with
+the results of an earlier run:
+    python -m project.Benchmarks.hot_paths --output baseline.json
+    python -m project.Benchmarks.hot_paths --baseline baseline.json
+The second run exits with status 1 if a benchmark got slower than the baseline by more than the
+tolerance. Timings depend on the machine, so a baseline should be made on the machine it is
+compared on.
+
+Every benchmark is run on generated data in a temporary directory & the best of a few runs is kept.
+The views of ContactsPage are timed through the ContactService calls they are made of
+(order_contact, visible_names for refresh_fields, letter_index for scroll_to_letter), so no display
+is needed.
+"""
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+REPEAT = 5
+TOLERANCE = 0.25
+SEED = 0
+# Shortest run of a benchmark, in seconds
+MIN_RUN_TIME = 0.05
+# Query of the search benchmark; "al" is a prefix, as when the user is still typing
+SEARCH_QUERY = "ray al"
+# Letters the guesser is asked to find, one game each
+SECRETS = "etaoinsz"
+MAX_QUESTIONS = 50
+
+
+def best_time(function, repeat: int, setup=None) -> float:
+    """
+    Times a function a few times. A run calls the function as many times as needed to last
+        MIN_RUN_TIME, so that fast functions aren't lost in the noise of the timer.
+    :param function: The function to time, called without arguments
+    :param repeat: Number of runs
+    :param setup: Function called before every call of function, outside of the timing
+    :return: Seconds taken by one call in the fastest run
+    """
+    if setup is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            if time.perf_counter() - start >= MIN_RUN_TIME:
+                break
+            number *= 10
+
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            best = min(best, (time.perf_counter() - start) / number)
+            continue
+        # Every call needs its own setup, so the calls are timed one by one
+        elapsed = 0.0
+        calls = 0
+        while elapsed < MIN_RUN_TIME:
+            setup()
+            start = time.perf_counter()
+            function()
+            elapsed += time.perf_counter() - start
+            calls += 1
+        best = min(best, elapsed / calls)
+    return best
+
+
+def contact_benchmarks(size: int, repeat: int, directory: str, seed: int) -> dict:
+    """
+    Times the contact views & the contact file on a book of generated contacts
+    :param size: Number of contacts
+    :param repeat: Number of runs of each benchmark
+    :param directory: Directory for the contact files
+    :param seed: Seed of the contacts & of the alphabetical orders
+    :return: Dictionary of benchmark -> seconds
+    """
+    snapshot_path = os.path.join(directory, 'contacts_pickle')
+    write_contacts(generate_contacts(size, seed), snapshot_path)
+    book = ContactBook(JournalStore(snapshot_path, os.path.join(directory, 'contacts_journal')))
+    service = ContactService(book)
+    results = {'load': best_time(service.load, repeat)}
+
+    rng = random.Random(seed)
+
+    def shuffle() -> None:
+        # A new order every run, so that the ordering is never in the cache
+        rng.shuffle(service.alphabetical_order)
+
+    results['order_contact'] = best_time(service.order_contact, repeat, shuffle)
+    results['refresh_fields'] = best_time(lambda: (service.visible_names(""), service.letters()),
+                                          repeat, shuffle)
+    results['refresh_fields_search'] = best_time(lambda: service.visible_names(SEARCH_QUERY),
+                                                 repeat)
+    names = service.visible_names("")
+    letters = service.letters()
+
+    def scroll_to_every_letter() -> None:
+        for letter in letters:
+            service.letter_index(letter, names, "")
+
+    results['scroll_to_letter'] = best_time(scroll_to_every_letter, repeat) / len(letters)
+
+    contact = book.get(names[0])
+
+    def change() -> None:
+        # One contact changed since the last save, as when the Save button is clicked after an edit
+        book.store.update(contact)
+
+    # Compaction is timed on its own, so that a run doesn't depend on when the journal gets long
+    results['save'] = best_time(lambda: book.save(compact=False), repeat, change)
+
+    def compact() -> None:
+        # Writes the whole contact file, as when the journal is compacted
+        book.store.compact()
+        book.store.wait()
+
+    results['compact'] = best_time(compact, repeat)
+    return results
+
+
+def write_words(path: str, count: int, seed: int) -> None:
+    """
+    Writes a file with the format of words.txt; the words of words.txt come first, then phrases of
+        2 or 3 of its words
+    :param path: Path of the file
+    :param count: Number of words/phrases
+    :param seed: Seed of the phrases
+    :return: None
+    """
+    with open("project/AlphabetGuesser/words.txt", encoding='utf-8') as infile:
+        words = [line.strip() for line in infile if line.strip() != '']
+    rng = np.random.default_rng(seed)
+    phrases = words[:count]
+    remaining = count - len(phrases)
+    if remaining > 0:
+        picks = rng.integers(0, len(words), (remaining, 3)).tolist()
+        lengths = rng.integers(2, 4, remaining).tolist()
+        phrases += [' '.join(words[i] for i in pick[:length])
+                    for pick, length in zip(picks, lengths)]
+    with open(path, 'w', encoding='utf-8') as outfile:
+        outfile.write('\n'.join(phrases) + '\n')
+
+
+def play(guesser: LetterGuesser, secret: str, seed: int) -> tuple:
+    """
+    Plays a game of the letter guesser, answering every question truthfully
+    :param guesser: The LetterGuesser
+    :param secret: The character to find
+    :param seed: Seed of the words/phrases picked by request_word
+    :return: (seconds taken by request_word, seconds taken by answer, number of questions)
+    """
+    guesser.restart()
+    random.seed(seed)
+    request_time = answer_time = 0.0
+    questions = 0
+    while len(guesser.possible_characters) > 1 and questions < MAX_QUESTIONS and \
+            guesser.words_left() > 0:
+        start = time.perf_counter()
+        word = guesser.request_word()
+        requested = time.perf_counter()
+        guesser.answer(word, "Yes" if secret in word else "No")
+        answer_time += time.perf_counter() - requested
+        request_time += requested - start
+        questions += 1
+    return request_time, answer_time, questions
+
+
+def guesser_benchmarks(size: int, repeat: int, directory: str, seed: int) -> dict:
+    """
+    Times create_dictionary & the letter guesser on a corpus of generated phrases
+    :param size: Number of words/phrases
+    :param repeat: Number of runs of each benchmark
+    :param directory: Directory for the words & corpus files
+    :param seed: Seed of the phrases & of the games
+    :return: Dictionary of benchmark -> seconds
+    """
+    words_path = os.path.join(directory, 'words.txt')
+    corpus_path = os.path.join(directory, 'words_corpus')
+    write_words(words_path, size, seed)
+    results = {'create_dictionary': best_time(lambda: create_dictionary(words_path, corpus_path),
+                                              repeat)}
+
+    guesser = LetterGuesser(corpus=open_corpus(corpus_path))
+    request_word = answer = float('inf')
+    for _ in range(repeat):
+        # Every secret is played, again & again until the run lasts MIN_RUN_TIME
+        request_time = answer_time = 0.0
+        questions = 0
+        while True:
+            for secret in SECRETS:
+                game = play(guesser, secret, seed)
+                request_time, answer_time = request_time + game[0], answer_time + game[1]
+                questions += game[2]
+            if questions == 0 or request_time + answer_time >= MIN_RUN_TIME:
+                break
+        request_word = min(request_word, request_time / max(1, questions))
+        answer = min(answer, answer_time / max(1, questions))
+    results['LetterGuesser.request_word'] = request_word
+    results['LetterGuesser.answer'] = answer
+    return results
+
+
+GROUPS = {'contacts': contact_benchmarks, 'guesser': guesser_benchmarks}
+
+
+def run(sizes: list, repeat=REPEAT, seed=SEED, groups=tuple(GROUPS)) -> dict:
+    """
+    Runs the benchmarks
+    :param sizes: Numbers of contacts & of phrases to run them at
+    :param repeat: Number of runs of each benchmark; the fastest one is kept
+    :param seed: Seed of the generated data
+    :param groups: Keys of GROUPS to run
+    :return: Dictionary of the metadata & the results, {benchmark: {size: seconds}}
+    """
+    results = {}
+    for size in sizes:
+        for group in groups:
+            directory = tempfile.mkdtemp(prefix='benchmark-')
+            try:
+                timings = GROUPS[group](size, repeat, directory, seed)
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+            for name, seconds in timings.items():
+                results.setdefault(name, {})[str(size)] = seconds
+                print("{:<28} {:>9} {:>12.3f} ms".format(name, size, seconds * 1000))
+    return {'metadata': {'python': platform.python_version(), 'numpy': np.__version__,
+                         'platform': platform.platform(), 'machine': platform.machine(),
+                         'repeat': repeat, 'seed': seed,
+                         'date': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': results}
+
+
+def compare(report: dict, baseline: dict, tolerance=TOLERANCE) -> list:
+    """
+    Prints the change of every benchmark that is also in the baseline
+    :param report: Report returned by run
+    :param baseline: Report of an earlier run
+    :param tolerance: Largest slowdown that isn't a regression, e.g. 0.25 for 25%
+    :return: List of the regressions, as (benchmark, size, baseline seconds, seconds)
+    """
+    regressions = []
+    print("{:<28} {:>9} {:>12} {:>12} {:>8}".format(
+        "benchmark", "size", "baseline ms", "ms", "change"))
+    for name, timings in report['results'].items():
+        for size, seconds in timings.items():
+            before = baseline.get('results', {}).get(name, {}).get(size)
+            if before is None:
+                continue
+            change = seconds / before - 1 if before > 0 else 0.0
+            regressed = change > tolerance
+            if regressed:
+                regressions.append((name, size, before, seconds))
+            print("{:<28} {:>9} {:>12.3f} {:>12.3f} {:>+7.0%}{}".format(
+                name, size, before * 1000, seconds * 1000, change,
+                "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times the hot paths of the app")
+    parser.add_argument('sizes', nargs='*', type=int, default=SIZES)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--only', choices=sorted(GROUPS), action='append', default=None,
+                        help="runs only this group of benchmarks; may be given more than once")
+    parser.add_argument('--output', default=None, help="writes the results to this JSON file")
+    parser.add_argument('--baseline', default=None, help="JSON file of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="slowdown allowed before failing, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.repeat, args.seed, args.only or tuple(GROUPS))
+    if args.output is not None:
+        with open(args.output, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as infile:
+            regressions = compare(report, json.load(infile), args.tolerance)
+        if len(regressions) > 0:
+            print("{} benchmarks regressed by more than {:.0%}".format(len(regressions),
+                                                                       args.tolerance))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
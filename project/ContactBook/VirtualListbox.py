@@ -0,0 +1,187 @@
+import tkinter as tk
+from tkinter import END
+
+
+class VirtualListbox(tk.Listbox):
+    """
+    Listbox that shows the rows of a model sequence, but only ever holds the rows that are visible.
+    Scrolling moves a window over the model, so the cost of scrolling or of showing a new model
+    doesn't depend on the size of the model.
+
+    Indices given to & returned by get, see, curselection, selection_set and selection_clear are
+    indices in the model; the underlying rows should not be changed with insert or delete.
+    The arrow keys & Page Up/Page Down move the selection through the model, not only through the
+    visible rows, and announce it with <<ListboxSelect>>.
+
+    === Public Attributes ===
+    model: Sequence of the rows to show; it is read, never modified
+    first: Index in the model of the first visible row
+    rows: Number of visible rows
+
+    === Methods ===
+    set_model: Shows a new model & scrolls back to the top
+    refresh: Shows the visible rows again; to call when the model was changed in place
+    row_inserted: Shows a row that was inserted in the model
+    row_deleted: Hides a row that was deleted from the model
+    yview: Same as Listbox.yview, in model rows
+    """
+
+    def __init__(self, master, yscrollcommand=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.__yscrollcommand = yscrollcommand
+        self.__selected = None
+        self.model = []
+        self.first = 0
+        self.rows = int(self['height'])
+
+        self.bind("<Configure>", self.__on_configure, add='+')
+        self.bind("<<ListboxSelect>>", self.__on_select, add='+')
+        # On X11 the wheel is sent as buttons 4 & 5, whose class bindings scroll the real rows
+        self.bind("<Button-4>", lambda event: self.__scroll(-1))
+        self.bind("<Button-5>", lambda event: self.__scroll(1))
+        # The class bindings of the keys would stop at the first or last visible row
+        self.bind("<Up>", lambda event: self.__move(-1))
+        self.bind("<Down>", lambda event: self.__move(1))
+        self.bind("<Prior>", lambda event: self.__move(-self.rows))
+        self.bind("<Next>", lambda event: self.__move(self.rows))
+
+    def set_model(self, model) -> None:
+        self.model = model
+        self.first = 0
+        self.__selected = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.first = max(0, min(self.first, len(self.model) - self.rows))
+        super().delete(0, END)
+        visible = self.model[self.first:self.first + self.rows]
+        if len(visible) > 0:
+            super().insert(END, *visible)
+        if self.__selected is not None and 0 <= self.__selected - self.first < len(visible):
+            super().selection_set(self.__selected - self.first)
+        self.__update_scroll()
+
+    def row_inserted(self, index: int) -> None:
+        """
+        Updates the view after a row was inserted in the model; the visible rows stay the same
+            unless the new row is one of them
+        :param index: Index of the new row in the model
+        :return: None
+        """
+        if self.__selected is not None and self.__selected >= index:
+            self.__selected += 1
+        if index < self.first:
+            self.first += 1
+        elif index < self.first + self.rows:
+            super().insert(index - self.first, self.model[index])
+            if super().size() > self.rows:
+                super().delete(self.rows)
+        self.__update_scroll()
+
+    def row_deleted(self, index: int) -> None:
+        """
+        Updates the view after a row was deleted from the model
+        :param index: Index the row had in the model
+        :return: None
+        """
+        if self.__selected == index:
+            self.__selected = None
+        elif self.__selected is not None and self.__selected > index:
+            self.__selected -= 1
+        if index < self.first:
+            self.first -= 1
+        elif index < self.first + self.rows:
+            super().delete(index - self.first)
+            last = self.first + self.rows - 1
+            if last < len(self.model):
+                super().insert(END, self.model[last])
+                if self.__selected == last:
+                    super().selection_set(self.rows - 1)
+        if self.first > 0 and self.first + self.rows > len(self.model):
+            # The end of the model is visible; scroll up to keep the view full
+            self.refresh()
+        self.__update_scroll()
+
+    def yview(self, *args):
+        if len(args) == 0:
+            if len(self.model) == 0:
+                return 0.0, 1.0
+            return (self.first / len(self.model),
+                    min(1.0, (self.first + self.rows) / len(self.model)))
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.model))
+        elif args[0] == 'scroll':
+            step = self.rows if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self.refresh()
+
+    def see(self, index) -> None:
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.rows:
+            self.first = index - self.rows + 1
+        self.refresh()
+
+    def get(self, first, last=None):
+        if last is None:
+            return self.model[first]
+        if last == END:
+            last = len(self.model) - 1
+        return tuple(self.model[first:last + 1])
+
+    def size(self) -> int:
+        return len(self.model)
+
+    def curselection(self) -> tuple:
+        if self.__selected is None:
+            return ()
+        return self.__selected,
+
+    def selection_set(self, first, last=None) -> None:
+        self.__selected = first
+        self.refresh()
+
+    def selection_clear(self, first, last=None) -> None:
+        self.__selected = None
+        super().selection_clear(0, END)
+
+    def __update_scroll(self) -> None:
+        if self.__yscrollcommand is not None:
+            self.__yscrollcommand(*self.yview())
+
+    def __scroll(self, units) -> str:
+        self.yview('scroll', units, 'units')
+        return "break"
+
+    def __move(self, rows: int) -> str:
+        """
+        Moves the selection through the model & scrolls to it
+        :param rows: Number of rows to move by; negative to move up
+        :return: "break", so that the class bindings don't move the selection again
+        """
+        if len(self.model) == 0:
+            return "break"
+        if self.__selected is None:
+            # Nothing is selected yet; the first visible row is selected
+            index = self.first
+        else:
+            index = max(0, min(self.__selected + rows, len(self.model) - 1))
+        self.__selected = index
+        self.see(index)
+        self.activate(index - self.first)
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def __on_select(self, event) -> None:
+        selection = super().curselection()
+        if len(selection) > 0:
+            self.__selected = self.first + selection[0]
+
+    def __on_configure(self, event) -> None:
+        line_height = int(self.tk.call('font', 'metrics', self['font'], '-linespace')) + \
+            2 * int(self['selectborderwidth'])
+        border = 2 * (int(self['borderwidth']) + int(self['highlightthickness']))
+        rows = max(1, (event.height - border) // line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
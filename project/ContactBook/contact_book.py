@@ -0,0 +1,319 @@
+import threading
+from project.contact import Contact
+from project.ContactBook.contact_index import ContactIndex
+from project.ContactBook.contact_order import OrderingCache
+from project.ContactBook.contact_search import SearchIndex
+from project.ContactBook.fuzzy_names import TrigramIndex
+
+EVENTS = ['added', 'removed', 'renamed', 'updated', 'loaded', 'imported']
+
+
+class ContactBook:
+    """
+    ContactBook:
+        Model of the contacts. Every change goes through it, so that the store, the cached
+        orderings, the reverse indexes & the search index are kept up to date, and is announced to
+        the subscribed views with one of the following events:
+        'added' (name), 'removed' (name), 'renamed' (old name, new name), 'updated' (name),
+        'loaded' (), 'imported' (number of contacts)
+        Contacts returned by get are watched, so changing them through their own methods (e.g.
+        change_phone_number) updates the store & the indexes as well. A contact stops being watched
+        once it is deleted or replaced.
+        The indexes are empty until load is called.
+
+    === Public Attributes ===
+    store: JournalStore or SQLiteStore in which the contacts are loaded & saved
+    order_cache: OrderingCache of the names of the contacts
+    index: ContactIndex of the phone numbers, emails & addresses of the contacts
+    search_index: SearchIndex of the names, emails, addresses & notes of the contacts
+    loaded: Whether load was called
+
+    === Methods ===
+    subscribe: Calls a function every time an event happens
+    unsubscribe: Stops calling a function subscribed to an event
+    get: Returns the contact with a given name
+    find_phone: Returns the contact with a phone number
+    find_email: Returns the contact with an email
+    find_address: Returns the contacts with an address
+    duplicates: Returns the phone numbers & emails of a contact that belong to another contact
+    search: Returns the names of the contacts matching a query, best first
+    fuzzy_find: Returns the names closest to a misspelled name
+    prepare_fuzzy_find: Builds the index of fuzzy_find in a background thread
+    add: Adds a contact, or replaces the contact with the same name
+    add_many: Adds or replaces many contacts without announcing each of them, unless they have
+        the phone numbers or emails of other contacts
+    finish_import: Announces the contacts added with add_many
+    delete: Deletes a contact
+    rename: Changes the name of a contact
+    load: Loads the contacts from the store
+    save: Saves the changes in the store
+    has_unsaved_changes: Returns whether some changes aren't saved in the store yet
+    ordering: Returns the Ordering of the names for a shuffled alphabet
+    order: Returns the names ordered with a shuffled alphabet
+    find: Returns the index of the first name starting with a prefix in an ordering
+    """
+
+    def __init__(self, store) -> None:
+        self.store = store
+        # Filled by load; a SQLiteStore can already read its contacts, but building the indexes
+        # here would only be done again by load
+        self.order_cache = OrderingCache()
+        self.index = ContactIndex()
+        self.search_index = SearchIndex()
+        self.loaded = False
+        # Built by prepare_fuzzy_find in the background, or else by the first fuzzy_find, since
+        # most batch jobs never need it
+        self.__fuzzy_index = None
+        # (thread, dictionary the thread puts the index in) while prepare_fuzzy_find is running
+        self.__fuzzy_build = None
+        # (old name, new name) of the changes made while the index is being built; a name is None
+        # when it was added or removed
+        self.__fuzzy_changes = []
+        # Name -> the contact returned by get that is watched for it
+        self.__watched = {}
+        self.__subscribers = {event: [] for event in EVENTS}
+
+    def __len__(self) -> int:
+        return len(self.store.contacts)
+
+    def __contains__(self, name) -> bool:
+        return name in self.store.contacts
+
+    def __iter__(self):
+        return iter(self.store.contacts)
+
+    def subscribe(self, event: str, callback) -> None:
+        self.__subscribers[event].append(callback)
+
+    def unsubscribe(self, event: str, callback) -> None:
+        self.__subscribers[event].remove(callback)
+
+    def get(self, name: str) -> Contact:
+        # A SQLiteStore reads a new object every time, so the one that is already watched is
+        # returned again; it has every change made through the book
+        contact = self.__watched.get(name)
+        if contact is None:
+            contact = self.store.contacts[name]
+            contact.watch(self.__on_contact_changed)
+            self.__watched[name] = contact
+        return contact
+
+    def find_phone(self, number: str):
+        name = self.index.find_phone(number)
+        return None if name is None else self.get(name)
+
+    def find_email(self, email: str):
+        name = self.index.find_email(email)
+        return None if name is None else self.get(name)
+
+    def find_address(self, address: str) -> list:
+        return [self.get(name) for name in self.index.find_address(address)]
+
+    def duplicates(self, contact: Contact) -> list:
+        """
+        Returns the phone numbers & emails of a contact that already belong to another contact
+        :param contact: The contact to check, before it is added
+        :return: List of (kind, value, name of the other contact)
+        """
+        return self.index.duplicates(contact)
+
+    def search(self, query: str, limit=None) -> list:
+        return self.search_index.search(query, limit)
+
+    def fuzzy_find(self, query: str, limit=5) -> list:
+        """
+        Returns the names closest to a name that may be misspelled
+        :param query: The name, or one word of the name, to look for
+        :param limit: Maximum number of names to return
+        :return: List of (name, number of edits), closest first; empty while prepare_fuzzy_find
+            is still building the index, so that the caller can fall back to its exact search
+        """
+        if self.__fuzzy_build is not None:
+            thread, result = self.__fuzzy_build
+            if thread.is_alive():
+                return []
+            self.__fuzzy_build = None
+            self.__fuzzy_index = result['index']
+            for old, new in self.__fuzzy_changes:
+                self.__fuzzy_change(old, new)
+            self.__fuzzy_changes = []
+        if self.__fuzzy_index is None:
+            self.__fuzzy_index = TrigramIndex(self.order_cache)
+        return self.__fuzzy_index.find(query, limit)
+
+    def prepare_fuzzy_find(self) -> None:
+        """
+        Builds the index of fuzzy_find in a background thread, so that the first misspelled search
+            of the app doesn't wait for it; the names are copied first & the changes made during
+            the build are applied once it is done. Nothing is done if the index is already built
+            or being built.
+        :return: None
+        """
+        if self.__fuzzy_index is not None or self.__fuzzy_build is not None:
+            return
+        names = list(self.order_cache)
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(index=TrigramIndex(names)),
+                                  daemon=True)
+        self.__fuzzy_build = thread, result
+        self.__fuzzy_changes = []
+        thread.start()
+
+    def add(self, contact: Contact) -> None:
+        if contact.name in self.store.contacts:
+            old_contact = self.store.contacts[contact.name]
+            self.__unwatch(contact.name)
+            old_contact.watch(None)
+            self.index.remove(contact.name, old_contact)
+            self.search_index.remove(contact.name, old_contact)
+            self.store.update(contact)
+            self.index.add(contact.name, contact)
+            self.search_index.add(contact.name, contact)
+            self.__notify('updated', contact.name)
+        else:
+            self.store.add(contact)
+            self.order_cache.add(contact.name)
+            self.index.add(contact.name, contact)
+            self.search_index.add(contact.name, contact)
+            self.__fuzzy_change(None, contact.name)
+            self.__notify('added', contact.name)
+
+    def add_many(self, contacts: list) -> list:
+        """
+        Adds or replaces many contacts; nothing is announced until finish_import is called, so the
+            views are refreshed once instead of once per contact. Like ContactService.add, a
+            contact with a phone number or an email of another contact, including one added
+            earlier in contacts, is refused.
+        :param contacts: List of Contacts
+        :return: List of (name, duplicates) of the contacts that were refused, with the
+            duplicates as returned by duplicates
+        """
+        new_names = []
+        refused = []
+        for contact in contacts:
+            duplicates = self.index.duplicates(contact)
+            if len(duplicates) > 0:
+                refused.append((contact.name, duplicates))
+                continue
+            if contact.name in self.store.contacts:
+                old_contact = self.store.contacts[contact.name]
+                self.__unwatch(contact.name)
+                old_contact.watch(None)
+                self.index.remove(contact.name, old_contact)
+                self.search_index.remove(contact.name, old_contact)
+                self.store.update(contact)
+            else:
+                self.store.add(contact)
+                new_names.append(contact.name)
+                self.__fuzzy_change(None, contact.name)
+            self.index.add(contact.name, contact)
+            self.search_index.add(contact.name, contact)
+        self.order_cache.add_many(new_names)
+        return refused
+
+    def finish_import(self, count: int) -> None:
+        self.__notify('imported', count)
+
+    def delete(self, name: str) -> None:
+        contact = self.store.contacts[name]
+        self.__unwatch(name)
+        contact.watch(None)
+        self.index.remove(name, contact)
+        self.search_index.remove(name, contact)
+        self.store.delete(name)
+        self.order_cache.remove(name)
+        self.__fuzzy_change(name, None)
+        self.__notify('removed', name)
+
+    def rename(self, name: str, new_name: str) -> None:
+        """
+        Changes the name of a contact
+        :param name: Current name of the contact
+        :param new_name: Name to be changed to; it must not be used by another contact
+        :return: None
+        """
+        if new_name in self.store.contacts:
+            raise KeyError(new_name)
+        self.get(name).change_name(new_name)
+
+    def load(self) -> None:
+        for name in list(self.__watched):
+            self.__unwatch(name)
+        self.store.load()
+        self.order_cache.reset(self.store.contacts)
+        self.index.reset(self.store.entries())
+        self.search_index.reset(self.store.contacts, self.store.entries())
+        # A build that is still running is for the contacts that were replaced
+        self.__fuzzy_index = None
+        self.__fuzzy_build = None
+        self.__fuzzy_changes = []
+        self.loaded = True
+        self.__notify('loaded')
+
+    def save(self, compact=True) -> None:
+        """
+        Saves the changes in the store
+        :param compact: Lets a JournalStore compact its journal if it is long enough; imports pass
+            False for every batch & compact once at the end
+        :return: None
+        """
+        self.store.save(compact)
+
+    def has_unsaved_changes(self) -> bool:
+        return self.store.has_unsaved_changes()
+
+    def ordering(self, order: list):
+        return self.order_cache.ordering(order)
+
+    def order(self, order: list) -> list:
+        return self.order_cache.order(order)
+
+    def find(self, order: list, prefix: str):
+        return self.order_cache.find(order, prefix)
+
+    def __fuzzy_change(self, old, new) -> None:
+        if self.__fuzzy_build is not None:
+            self.__fuzzy_changes.append((old, new))
+        elif self.__fuzzy_index is not None:
+            if old is not None:
+                self.__fuzzy_index.remove(old)
+            if new is not None:
+                self.__fuzzy_index.add(new)
+
+    def __unwatch(self, name: str) -> None:
+        contact = self.__watched.pop(name, None)
+        if contact is not None:
+            contact.watch(None)
+
+    def __on_contact_changed(self, contact: Contact, kind: str, old, new) -> None:
+        # A contact that was deleted, replaced or read again must not change the one in the store
+        if self.__watched.get(old if kind == 'Name' else contact.name) is not contact:
+            contact.watch(None)
+            return
+        if kind != 'Name':
+            self.index.change(contact.name, kind, old, new)
+            self.search_index.change(contact.name, kind, old, new)
+            self.store.update(contact)
+            self.__notify('updated', contact.name)
+        elif new == old:
+            return
+        elif new in self.store.contacts:
+            contact.name = old
+            raise KeyError(new)
+        else:
+            self.store.delete(old)
+            self.order_cache.remove(old)
+            self.index.remove(old, contact)
+            self.search_index.remove(old, contact)
+            self.store.add(contact)
+            del self.__watched[old]
+            self.__watched[new] = contact
+            self.order_cache.add(new)
+            self.index.add(new, contact)
+            self.search_index.add(new, contact)
+            self.__fuzzy_change(old, new)
+            self.__notify('renamed', old, new)
+
+    def __notify(self, event: str, *args) -> None:
+        for callback in list(self.__subscribers[event]):
+            callback(*args)
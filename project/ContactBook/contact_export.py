@@ -0,0 +1,161 @@
+import argparse
+import csv
+import json
+from itertools import islice
+from project.contact import PHONE_TYPES
+
+"""
+Exports the contacts to vCard, CSV & JSONL files. Contacts are read from the store a page at a time
+& every record is written as soon as it is made, through a large file buffer, so exporting uses the
+same memory whatever the size of the book. Files written here can be imported again with
+contact_import (vCard & CSV).
+"""
+BUFFER_SIZE = 1 << 20
+# Number of contacts read from the store at once
+READ_SIZE = 500
+# Header of the CSV files, one column per kind of value of Contact.entries
+CSV_HEADER = ['Name', 'Home Phone', 'Work Phone', 'Personal Phone', 'Email', 'Address', 'Notes']
+CSV_KINDS = ['Home', 'Work', 'Personal', 'Email', 'Physical', 'Note']
+# Type of phone number -> TYPE of a vCard TEL
+VCARD_PHONE_TYPES = {'Home': 'HOME', 'Work': 'WORK', 'Personal': 'CELL'}
+
+
+def iter_contacts(book, order=None):
+    """
+    Reads the contacts of a book, READ_SIZE contacts at a time
+    :param book: The ContactBook
+    :param order: The 26 lowercase letters to sort the names with, or None for the order in which
+        the contacts were added
+    :return: Generator of Contacts
+    """
+    names = iter(book if order is None else book.order(order))
+    while True:
+        page = list(islice(names, READ_SIZE))
+        if len(page) == 0:
+            return
+        yield from book.store.get_many(page)
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace(',', '\\,') \
+        .replace(';', '\\;')
+
+
+def fold_line(line: str) -> str:
+    """
+    Folds a vCard line so that no line is longer than 75 characters
+    :param line: The line, without its line break
+    :return: The folded line, ending with a line break
+    """
+    if len(line) <= 75:
+        return line + '\r\n'
+    parts = [line[:75]] + [line[i:i + 74] for i in range(75, len(line), 74)]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def write_vcard(contacts, outfile) -> int:
+    count = 0
+    for contact in contacts:
+        given, _, family = contact.name.rpartition(' ')
+        lines = ['BEGIN:VCARD', 'VERSION:3.0', 'FN:' + escape(contact.name),
+                 'N:' + escape(family) + ';' + escape(given) + ';;;']
+        for kind, value in contact.entries():
+            if kind in PHONE_TYPES:
+                lines.append('TEL;TYPE=' + VCARD_PHONE_TYPES[kind] + ':' + escape(value))
+            elif kind == 'Email':
+                lines.append('EMAIL;TYPE=INTERNET:' + escape(value))
+            elif kind == 'Physical':
+                lines.append('ADR;TYPE=HOME:;;' + escape(value) + ';;;;')
+            elif kind == 'Note':
+                lines.append('NOTE:' + escape(value))
+        lines.append('END:VCARD')
+        outfile.write(''.join(fold_line(line) for line in lines))
+        count += 1
+    return count
+
+
+def write_csv(contacts, outfile) -> int:
+    writer = csv.writer(outfile)
+    writer.writerow(CSV_HEADER)
+    count = 0
+    for contact in contacts:
+        columns = {kind: [] for kind in CSV_KINDS}
+        for kind, value in contact.entries():
+            columns[kind].append(value)
+        # Values are separated by ';' in a cell, as contact_import expects
+        writer.writerow([contact.name] + [';'.join(columns[kind]) for kind in CSV_KINDS])
+        count += 1
+    return count
+
+
+def write_jsonl(contacts, outfile) -> int:
+    """
+    Writes one JSON object per line, with the same fields as a pickled Contact
+    """
+    count = 0
+    for contact in contacts:
+        record = {'name': contact.name,
+                  'phone_numbers': {num_type: list(contact.get_phone_numbers(num_type))
+                                    for num_type in PHONE_TYPES},
+                  'email_addresses': [], 'addresses': [], 'notes': []}
+        for kind, value in contact.entries():
+            if kind == 'Email':
+                record['email_addresses'].append(value)
+            elif kind == 'Physical':
+                record['addresses'].append(value)
+            elif kind == 'Note':
+                record['notes'].append(value)
+        outfile.write(json.dumps(record, ensure_ascii=False))
+        outfile.write('\n')
+        count += 1
+    return count
+
+
+WRITERS = {'vcard': write_vcard, 'csv': write_csv, 'jsonl': write_jsonl}
+EXTENSIONS = {'.vcf': 'vcard', '.vcard': 'vcard', '.csv': 'csv', '.jsonl': 'jsonl'}
+
+
+def guess_format(path: str) -> str:
+    for extension, name in EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return name
+    raise ValueError("Unknown format of {}; use one of {}".format(path, ', '.join(EXTENSIONS)))
+
+
+def export_contacts(book, path: str, file_format=None, order=None) -> int:
+    """
+    Writes every contact of a book to a file
+    :param book: The ContactBook to export
+    :param path: Path of the file to write
+    :param file_format: 'vcard', 'csv' or 'jsonl'; guessed from the extension of path if None
+    :param order: The 26 lowercase letters to sort the names with, or None for the order in which
+        the contacts were added
+    :return: Number of contacts written
+    """
+    writer = WRITERS[file_format or guess_format(path)]
+    with open(path, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as outfile:
+        return writer(iter_contacts(book, order), outfile)
+
+
+if __name__ == '__main__':
+    import string
+    import time
+    from project.ContactBook.contact_book import ContactBook
+    from project.ContactBook.journal_store import JournalStore
+    from project.ContactBook.sqlite_store import SQLiteStore
+
+    parser = argparse.ArgumentParser(description="Exports the contacts to a vCard, CSV or JSONL "
+                                                 "file")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=sorted(WRITERS), default=None)
+    parser.add_argument('--store', choices=["journal", "sqlite"], default="journal")
+    parser.add_argument('--sorted', action='store_true', help="sorts the contacts by name")
+    arguments = parser.parse_args()
+
+    contact_book = ContactBook(SQLiteStore() if arguments.store == "sqlite" else JournalStore())
+    contact_book.load()
+    start = time.perf_counter()
+    total = export_contacts(contact_book, arguments.path, arguments.format,
+                            list(string.ascii_lowercase) if arguments.sorted else None)
+    print("Exported {} contacts to {} ({:.0f} records/s)".format(
+        total, arguments.path, total / max(time.perf_counter() - start, 1e-9)))
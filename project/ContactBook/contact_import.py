@@ -0,0 +1,304 @@
+import argparse
+import csv
+import re
+import time
+from itertools import islice
+from project.contact import Contact, PHONE_TYPES
+from project.ContactBook.contact_index import normalize_phone
+
+"""
+Imports contacts from CSV & vCard files. Files are read one record at a time & the contacts are
+added to the book in batches, so the size of a file is only limited by the store.
+
+CSV files need a header; the columns are matched by name, ignoring case, e.g.
+    Name,Home Phone,Work Phone,Mobile,Email,Address,Notes
+A cell may hold several values separated by ';'. vCard files may hold any number of cards; FN (or
+N), TEL, EMAIL, ADR & NOTE are read.
+"""
+BATCH_SIZE = 1000
+
+# Header of a CSV column -> kind of value, with the kinds of Contact.entries
+CSV_COLUMNS = {'name': 'Name', 'full name': 'Name',
+               'home': 'Home', 'home phone': 'Home',
+               'work': 'Work', 'work phone': 'Work', 'business phone': 'Work',
+               'personal': 'Personal', 'personal phone': 'Personal', 'mobile': 'Personal',
+               'mobile phone': 'Personal', 'cell': 'Personal', 'phone': 'Personal',
+               'email': 'Email', 'e-mail': 'Email', 'email address': 'Email',
+               'address': 'Physical', 'home address': 'Physical',
+               'note': 'Note', 'notes': 'Note'}
+# TYPE of a vCard TEL -> type of phone number; numbers without a known type are Personal
+VCARD_PHONE_TYPES = {'HOME': 'Home', 'WORK': 'Work', 'CELL': 'Personal'}
+# An escaped character or a ';' between the components of a vCard value
+_ESCAPE_OR_SEPARATOR = re.compile(r'\\.|;')
+_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def format_phone_number(number: str) -> str:
+    """
+    Formats a phone number like the numbers entered in the app
+    :param number: The phone number, in any format
+    :return: The number as ###-###-####, or the number unchanged if it doesn't have 10 digits (or
+        11 digits starting with the country code 1)
+    """
+    digits = normalize_phone(number)
+    if len(digits) == 11 and digits[0] == '1':
+        digits = digits[1:]
+    if len(digits) != 10:
+        return number.strip()
+    return digits[:3] + '-' + digits[3:6] + '-' + digits[6:]
+
+
+def add_value(contact: Contact, kind: str, value: str) -> None:
+    """
+    Adds a value to a contact without going through its methods, which print every number
+    :param contact: The contact
+    :param kind: One of the kinds of Contact.entries
+    :param value: The value to add; nothing is done if it is blank
+    :return: None
+    """
+    value = value.strip()
+    if value == '':
+        return
+    if kind in PHONE_TYPES:
+        contact.append_phone_number(kind, format_phone_number(value))
+    elif kind == 'Email':
+        contact.email_addresses.append(value)
+    elif kind == 'Physical':
+        contact.addresses.append(value)
+    elif kind == 'Note':
+        contact.notes.append(value)
+
+
+def read_csv(path):
+    """
+    Reads the contacts of a CSV file one row at a time; rows without a name are skipped
+    :param path: Path of the file
+    :return: Generator of Contacts
+    """
+    with open(path, newline='', encoding='utf-8-sig') as infile:
+        reader = csv.reader(infile)
+        header = next(reader, [])
+        kinds = [CSV_COLUMNS.get(column.strip().lower()) for column in header]
+        if 'Name' not in kinds:
+            raise ValueError("{} has no name column".format(path))
+        name_column = kinds.index('Name')
+
+        for row in reader:
+            if name_column >= len(row) or row[name_column].strip() == '':
+                continue
+            contact = Contact(row[name_column].strip())
+            for kind, cell in zip(kinds, row):
+                if kind is not None and kind != 'Name':
+                    for value in cell.split(';'):
+                        add_value(contact, kind, value)
+            yield contact
+
+
+def unfold_lines(infile):
+    """
+    Joins the folded lines of a vCard file, which continue on the next lines starting with a space
+        or a tab
+    :param infile: The file
+    :return: Generator of unfolded lines
+    """
+    line = None
+    for raw_line in infile:
+        raw_line = raw_line.rstrip('\r\n')
+        if raw_line[:1] in (' ', '\t') and line is not None:
+            line += raw_line[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw_line
+    if line is not None:
+        yield line
+
+
+def unescape(value: str) -> str:
+    # One pass, so that an escaped backslash followed by n stays a backslash & an n
+    return _ESCAPE.sub(lambda match: '\n' if match.group(1) in 'nN' else match.group(1), value)
+
+
+def split_components(value: str) -> list:
+    """
+    Splits a vCard value like N or ADR into its components; an escaped ';' doesn't separate them
+    :param value: The value, still escaped
+    :return: List of the components, still escaped
+    """
+    components = []
+    start = 0
+    for match in _ESCAPE_OR_SEPARATOR.finditer(value):
+        if match.group() == ';':
+            components.append(value[start:match.start()])
+            start = match.end()
+    components.append(value[start:])
+    return components
+
+
+def read_vcard(path):
+    """
+    Reads the contacts of a vCard file one card at a time; cards without a name are skipped
+    :param path: Path of the file
+    :return: Generator of Contacts
+    """
+    with open(path, encoding='utf-8-sig') as infile:
+        properties = None
+        for line in unfold_lines(infile):
+            name, _, value = line.partition(':')
+            name, *parameters = name.upper().split(';')
+            # Properties may be grouped, e.g. item1.EMAIL
+            name = name.rpartition('.')[2]
+            if name == 'BEGIN' and value.upper() == 'VCARD':
+                properties = []
+            elif name == 'END' and value.upper() == 'VCARD' and properties is not None:
+                contact = card_contact(properties)
+                properties = None
+                if contact is not None:
+                    yield contact
+            elif properties is not None:
+                properties.append((name, parameters, value))
+
+
+def card_contact(properties: list):
+    """
+    Makes a contact from the properties of a vCard
+    :param properties: List of (name, parameters, value)
+    :return: The Contact, or None if the card has no name
+    """
+    names = [unescape(value) for name, _, value in properties if name == 'FN']
+    if len(names) == 0:
+        # N is Family;Given;Additional;Prefixes;Suffixes
+        names = [' '.join(unescape(part) for part in reversed(split_components(value)[:2]) if part)
+                 for name, _, value in properties if name == 'N']
+    if len(names) == 0 or names[0].strip() == '':
+        return None
+
+    contact = Contact(names[0].strip())
+    for name, parameters, value in properties:
+        if name == 'TEL':
+            types = {part for parameter in parameters
+                     for part in parameter.replace('TYPE=', '').split(',')}
+            num_type = next((VCARD_PHONE_TYPES[part] for part in ['HOME', 'WORK', 'CELL']
+                             if part in types), 'Personal')
+            add_value(contact, num_type, unescape(value))
+        elif name == 'EMAIL':
+            add_value(contact, 'Email', unescape(value))
+        elif name == 'ADR':
+            # ADR is PO box;Extended;Street;Locality;Region;Postal code;Country
+            parts = [unescape(part).strip() for part in split_components(value)]
+            add_value(contact, 'Physical', ', '.join(part for part in parts if part))
+        elif name == 'NOTE':
+            add_value(contact, 'Note', unescape(value))
+    return contact
+
+
+READERS = {'csv': read_csv, 'vcard': read_vcard}
+EXTENSIONS = {'.csv': 'csv', '.vcf': 'vcard', '.vcard': 'vcard'}
+
+
+def guess_format(path: str) -> str:
+    for extension, name in EXTENSIONS.items():
+        if path.lower().endswith(extension):
+            return name
+    raise ValueError("Unknown format of {}; use one of {}".format(path, ', '.join(EXTENSIONS)))
+
+
+class ContactImport:
+    """
+    ContactImport:
+        Import of a file that runs one batch at a time, so that the app can handle its events
+        between the batches. Every batch is added to the book & saved in the store at once; the
+        last step compacts the store & announces the import to the views.
+
+    === Public Attributes ===
+    book: The ContactBook to import into
+    path: Path of the CSV or vCard file
+    batch_size: Number of contacts added at once
+    count: Number of contacts imported so far
+    skipped: List of (name, duplicates) of the contacts skipped so far, as returned by
+        ContactBook.add_many
+    done: Whether every contact of the file was imported
+
+    === Methods ===
+    step: Imports the next batch
+    rate: Returns the records imported per second
+    """
+
+    def __init__(self, book, path: str, file_format=None, batch_size=BATCH_SIZE) -> None:
+        self.book = book
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self.skipped = []
+        self.done = False
+        self.__contacts = READERS[file_format or guess_format(path)](path)
+        self.__start = time.perf_counter()
+
+    def step(self) -> bool:
+        """
+        Imports the next batch of contacts
+        :return: True if there may be more contacts to import, False once the import is done
+        """
+        if self.done:
+            return False
+        batch = list(islice(self.__contacts, self.batch_size))
+        if len(batch) == 0:
+            self.book.save()
+            self.book.finish_import(self.count)
+            self.done = True
+            return False
+        refused = self.book.add_many(batch)
+        # Compacting after every batch would write the whole book once per batch
+        self.book.save(compact=False)
+        self.count += len(batch) - len(refused)
+        self.skipped += refused
+        return True
+
+    def rate(self) -> float:
+        return self.count / max(time.perf_counter() - self.__start, 1e-9)
+
+
+def import_contacts(book, path: str, file_format=None, batch_size=BATCH_SIZE,
+                    progress=None) -> tuple:
+    """
+    Imports the contacts of a file in batches; every batch is added to the book & saved in the store
+        at once, and the views are told once everything is imported. The journal of a JournalStore
+        is only compacted once, at the end. A contact with the name of an existing contact
+        replaces it; a contact with a phone number or an email of another contact is skipped.
+    :param book: The ContactBook to import into
+    :param path: Path of the CSV or vCard file
+    :param file_format: 'csv' or 'vcard'; guessed from the extension of path if None
+    :param batch_size: Number of contacts added at once
+    :param progress: Function called with (number of contacts imported, records per second) after
+        every batch
+    :return: Tuple of the number of contacts imported, the list of (name, duplicates) of the
+        contacts skipped, as returned by ContactBook.add_many, & the records per second
+    """
+    contact_import = ContactImport(book, path, file_format, batch_size)
+    while contact_import.step():
+        if progress is not None:
+            progress(contact_import.count, contact_import.rate())
+    return contact_import.count, contact_import.skipped, contact_import.rate()
+
+
+if __name__ == '__main__':
+    from project.ContactBook.contact_book import ContactBook
+    from project.ContactBook.journal_store import JournalStore
+    from project.ContactBook.sqlite_store import SQLiteStore
+
+    parser = argparse.ArgumentParser(description="Imports contacts from a CSV or vCard file")
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=sorted(READERS), default=None)
+    parser.add_argument('--store', choices=["journal", "sqlite"], default="journal")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    arguments = parser.parse_args()
+
+    contact_book = ContactBook(SQLiteStore() if arguments.store == "sqlite" else JournalStore())
+    contact_book.load()
+    total, skipped_contacts, rate = import_contacts(
+        contact_book, arguments.path, arguments.format, arguments.batch_size,
+        progress=lambda done, speed: print("{} contacts ({:.0f} records/s)".format(done, speed)))
+    print("Imported {} contacts from {} ({:.0f} records/s)".format(total, arguments.path, rate))
+    for skipped_name, duplicates in skipped_contacts:
+        print("Skipped {}: {}".format(skipped_name, ', '.join(
+            "{} {} belongs to {}".format(kind, value, other) for kind, value, other in duplicates)))
@@ -0,0 +1,164 @@
+import re
+from typing import Dict, Set
+
+"""
+Reverse indexes of the contacts, so that a contact can be found from one of its phone numbers,
+emails or addresses without going through the whole book. Values are normalized before being
+indexed, so "514 555-0199" finds "514-555-0199" and "Ray@Gmail.com" finds "ray@gmail.com".
+"""
+PHONE_KINDS = ('Home', 'Work', 'Personal')
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(number: str) -> str:
+    return _NON_DIGITS.sub('', number)
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_address(address: str) -> str:
+    return ' '.join(address.lower().split())
+
+
+class ContactIndex:
+    """
+    ContactIndex:
+        Hash indexes of normalized phone number -> contact, email -> contact & address -> contacts.
+        A phone number or an email belongs to a single contact; if two contacts share one, the
+        first one indexed keeps it & the other is reported by duplicates. The other owners are
+        remembered, so the value is handed to the next one when its owner is removed.
+
+    === Public Attributes ===
+    phones: Dictionary of normalized phone number -> name of the contact
+    emails: Dictionary of normalized email -> name of the contact
+    addresses: Dictionary of normalized address -> set of the names of the contacts
+
+    === Methods ===
+    reset: Replaces everything in the index
+    add: Indexes every value of a contact
+    remove: Removes every value of a contact from the index
+    change: Updates the index after one value of a contact was added, changed or removed
+    find_phone: Returns the name of the contact with a phone number
+    find_email: Returns the name of the contact with an email
+    find_address: Returns the names of the contacts with an address
+    duplicates: Returns the phone numbers & emails of a contact that belong to another contact
+    """
+    phones: Dict[str, str]
+    emails: Dict[str, str]
+    addresses: Dict[str, Set[str]]
+
+    def __init__(self, entries=()) -> None:
+        self.phones = {}
+        self.emails = {}
+        self.addresses = {}
+        # Normalized value -> names of the contacts that have it besides its owner, in the order
+        # they were indexed; only shared values are in there
+        self.__other_phones = {}
+        self.__other_emails = {}
+        self.reset(entries)
+
+    def reset(self, entries) -> None:
+        """
+        Replaces everything in the index
+        :param entries: Iterable of (name, kind, value), as returned by the entries of a store
+        :return: None
+        """
+        self.phones = {}
+        self.emails = {}
+        self.addresses = {}
+        self.__other_phones = {}
+        self.__other_emails = {}
+        for name, kind, value in entries:
+            self.change(name, kind, None, value)
+
+    def add(self, name: str, contact) -> None:
+        for kind, value in contact.entries():
+            self.change(name, kind, None, value)
+
+    def remove(self, name: str, contact) -> None:
+        for kind, value in contact.entries():
+            self.change(name, kind, value, None)
+
+    def change(self, name: str, kind: str, old, new) -> None:
+        """
+        Updates the index after one value of a contact was added, changed or removed
+        :param name: Name of the contact
+        :param kind: Home, Work or Personal for phone numbers, Email, Physical or Note; notes
+            aren't indexed
+        :param old: Value before the change, or None if the value was added
+        :param new: Value after the change, or None if the value was removed
+        :return: None
+        """
+        if kind in PHONE_KINDS:
+            self.__change_unique(self.phones, self.__other_phones, name, old, new,
+                                 normalize_phone)
+        elif kind == 'Email':
+            self.__change_unique(self.emails, self.__other_emails, name, old, new,
+                                 normalize_email)
+        elif kind == 'Physical':
+            if old is not None:
+                names = self.addresses.get(normalize_address(old))
+                if names is not None:
+                    names.discard(name)
+                    if len(names) == 0:
+                        del self.addresses[normalize_address(old)]
+            if new is not None and normalize_address(new) != '':
+                self.addresses.setdefault(normalize_address(new), set()).add(name)
+
+    def find_phone(self, number: str):
+        return self.phones.get(normalize_phone(number))
+
+    def find_email(self, email: str):
+        return self.emails.get(normalize_email(email))
+
+    def find_address(self, address: str) -> Set[str]:
+        return set(self.addresses.get(normalize_address(address), ()))
+
+    def duplicates(self, contact, name=None) -> list:
+        """
+        Returns the phone numbers & emails of a contact that belong to another contact
+        :param contact: The contact to check
+        :param name: Name the contact is indexed with; defaults to the name of the contact
+        :return: List of (kind, value, name of the other contact)
+        """
+        name = contact.name if name is None else name
+        duplicates = []
+        for kind, value in contact.entries():
+            if kind in PHONE_KINDS:
+                key = normalize_phone(value)
+                owners = [self.phones.get(key)] + self.__other_phones.get(key, [])
+            elif kind == 'Email':
+                key = normalize_email(value)
+                owners = [self.emails.get(key)] + self.__other_emails.get(key, [])
+            else:
+                continue
+            other = next((owner for owner in owners if owner is not None and owner != name), None)
+            if other is not None:
+                duplicates.append((kind, value, other))
+        return duplicates
+
+    @staticmethod
+    def __change_unique(index: dict, others: dict, name: str, old, new, normalize) -> None:
+        # A name is listed once per value it has, so a contact with the same number twice keeps it
+        # until both are removed
+        if old is not None and normalize(old) != '':
+            key = normalize(old)
+            if index.get(key) == name:
+                if key in others:
+                    index[key] = others[key].pop(0)
+                    if len(others[key]) == 0:
+                        del others[key]
+                else:
+                    del index[key]
+            elif name in others.get(key, ()):
+                others[key].remove(name)
+                if len(others[key]) == 0:
+                    del others[key]
+        if new is not None and normalize(new) != '':
+            key = normalize(new)
+            if key in index:
+                others.setdefault(key, []).append(name)
+            else:
+                index[key] = name
@@ -0,0 +1,230 @@
+import string
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+"""
+Collation used to order the contacts with a shuffled alphabet. Names are compared character by
+character, ignoring case & accents ('É' is compared as 'e'), with the following rule:
+    space < letters, in the shuffled order < digits, from 0 to 9 < any other ASCII character, by
+    code point < any other Unicode character, by code point
+so that "Ann Lee" comes before "Anna", and a name is always placed after the names it starts with.
+Every character is translated to a code point that encodes its rank, so that comparing two
+translated names as plain strings gives the order above.
+"""
+_OTHER_ASCII = [chr(i) for i in range(128)
+                if chr(i) not in string.ascii_lowercase + string.digits + ' ']
+
+
+def collation_table(order: list) -> dict:
+    """
+    Builds the translation table of a shuffled alphabet, for use with str.translate
+    :param order: The 26 lowercase letters, in the order the names should be sorted with
+    :return: The translation table
+    """
+    table = {ord(' '): 0}
+    for rank, letter in enumerate(order, 1):
+        table[ord(letter)] = rank
+    for rank, digit in enumerate(string.digits, len(order) + 1):
+        table[ord(digit)] = rank
+    for rank, character in enumerate(_OTHER_ASCII, len(order) + len(string.digits) + 1):
+        table[ord(character)] = rank
+    return table
+
+
+def fold(name: str) -> str:
+    """
+    Lowercases a name & strips its accents
+    :param name: The name to fold
+    :return: The folded name
+    """
+    name = name.lower()
+    if name.isascii():
+        return name
+    return ''.join(character for character in unicodedata.normalize('NFKD', name)
+                   if not unicodedata.combining(character))
+
+
+def collation_key(name: str, table: dict) -> tuple:
+    """
+    Returns the key of a name for a given translation table; the name itself breaks the ties
+        between names that only differ by their case or accents
+    :param name: The name of the contact
+    :param table: Translation table made by collation_table
+    :return: The key
+    """
+    return fold(name).translate(table), name
+
+
+def order_names(names, order: list) -> list:
+    """
+    Orders names with a shuffled alphabet
+    :param names: Iterable of names
+    :param order: The 26 lowercase letters, in the order the names should be sorted with
+    :return: The ordered list
+    """
+    table = collation_table(order)
+    return sorted(names, key=lambda name: collation_key(name, table))
+
+
+class Ordering:
+    """
+    Ordering:
+        The names ordered with one shuffled alphabet, along with the index of the first name of
+        every leading character so that jumping to a letter doesn't need a search.
+
+    === Public Attributes ===
+    table: Translation table of the alphabet
+    keys: Sorted collation keys of the names
+    names: The names, in the same order as keys
+    first: Dictionary of translated leading character -> index of the first name starting with it
+
+    === Methods ===
+    insert: Inserts a name given its folded form
+    remove: Removes a name given its folded form
+    index: Returns the index of a name
+    find: Returns the index of the first name starting with a prefix
+    """
+
+    def __init__(self, order: list, folded: dict) -> None:
+        self.table = collation_table(order)
+        self.keys = sorted((folded_name.translate(self.table), name)
+                           for name, folded_name in folded.items())
+        self.names = [name for _, name in self.keys]
+        self.first = {}
+        for index, (key, _) in enumerate(self.keys):
+            self.first.setdefault(key[:1], index)
+
+    def insert(self, name: str, folded_name: str) -> None:
+        key = folded_name.translate(self.table), name
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.names.insert(index, name)
+        for leading, first in self.first.items():
+            if first >= index:
+                self.first[leading] = first + 1
+        if self.first.get(key[0][:1], index + 1) > index:
+            self.first[key[0][:1]] = index
+
+    def remove(self, name: str, folded_name: str) -> None:
+        key = folded_name.translate(self.table), name
+        index = bisect_left(self.keys, key)
+        del self.keys[index]
+        del self.names[index]
+        for leading, first in self.first.items():
+            if first > index:
+                self.first[leading] = first - 1
+        leading = key[0][:1]
+        if self.first[leading] == index and (index == len(self.keys) or
+                                             self.keys[index][0][:1] != leading):
+            del self.first[leading]
+
+    def index(self, name: str) -> int:
+        """
+        Returns the index of a name; if the name isn't in the ordering, returns the index it would
+            be inserted at
+        :param name: The name to look for
+        :return: The index
+        """
+        return bisect_left(self.keys, (fold(name).translate(self.table), name))
+
+    def find(self, prefix: str):
+        """
+        Returns the index of the first name starting with prefix, ignoring case & accents; O(1)
+            for a single character, O(log n) for longer prefixes
+        :param prefix: The prefix to look for
+        :return: The index, or None if no name starts with prefix
+        """
+        key = fold(prefix).translate(self.table)
+        if len(key) == 1:
+            return self.first.get(key)
+        index = bisect_left(self.keys, (key,))
+        if index < len(self.keys) and self.keys[index][0].startswith(key):
+            return index
+        return None
+
+
+class OrderingCache:
+    """
+    OrderingCache:
+        Keeps the folded key of every name & the orderings computed for the most recently used
+        alphabets, so ordering the same contacts again is free. Adding or removing a name updates
+        every cached ordering in place instead of sorting the names again.
+
+    === Public Attributes ===
+    maxsize: Number of orderings kept
+
+    === Methods ===
+    reset: Replaces all the names & clears the cached orderings
+    add: Adds a name to every cached ordering
+    add_many: Adds many names at once & clears the cached orderings
+    remove: Removes a name from every cached ordering
+    ordering: Returns the Ordering of a shuffled alphabet
+    order: Returns the names ordered with a shuffled alphabet
+    find: Returns the index of the first name starting with a prefix in an ordering
+    """
+
+    def __init__(self, names=(), maxsize=8) -> None:
+        self.maxsize = maxsize
+        self.__folded = {}
+        # alphabet tuple -> Ordering
+        self.__orders = OrderedDict()
+        self.reset(names)
+
+    def __len__(self) -> int:
+        return len(self.__folded)
+
+    def __iter__(self):
+        return iter(self.__folded)
+
+    def reset(self, names) -> None:
+        self.__folded = {name: fold(name) for name in names}
+        self.__orders.clear()
+
+    def add(self, name: str) -> None:
+        if name in self.__folded:
+            return
+        self.__folded[name] = fold(name)
+        for ordering in self.__orders.values():
+            ordering.insert(name, self.__folded[name])
+
+    def add_many(self, names) -> None:
+        """
+        Adds many names at once; the cached orderings are cleared rather than updated, since
+            sorting the names again is cheaper than inserting a large batch one name at a time
+        :param names: Iterable of names
+        :return: None
+        """
+        for name in names:
+            if name not in self.__folded:
+                self.__folded[name] = fold(name)
+        self.__orders.clear()
+
+    def remove(self, name: str) -> None:
+        if name not in self.__folded:
+            return
+        for ordering in self.__orders.values():
+            ordering.remove(name, self.__folded[name])
+        del self.__folded[name]
+
+    def ordering(self, order: list) -> Ordering:
+        alphabet = tuple(order)
+        if alphabet in self.__orders:
+            self.__orders.move_to_end(alphabet)
+            return self.__orders[alphabet]
+
+        self.__orders[alphabet] = Ordering(order, self.__folded)
+        if len(self.__orders) > self.maxsize:
+            self.__orders.popitem(last=False)
+        return self.__orders[alphabet]
+
+    def order(self, order: list) -> list:
+        """
+        Returns the names ordered with a shuffled alphabet
+        :param order: The 26 lowercase letters, in the order the names should be sorted with
+        :return: The ordered list; it is shared with the cache and must not be modified
+        """
+        return self.ordering(order).names
+
+    def find(self, order: list, prefix: str):
+        return self.ordering(order).find(prefix)
@@ -0,0 +1,177 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from project.ContactBook.contact_order import fold
+
+"""
+Full-text search over the contacts. Names, emails, addresses & notes are split into tokens of
+letters & digits, folded like the names are for ordering ('É' is searched as 'e'), and indexed in
+an inverted index of token -> contacts. Phone numbers are found with ContactIndex instead.
+"""
+# Weight of a token depending on where it comes from; other kinds of values aren't indexed
+WEIGHTS = {'Name': 3, 'Email': 2, 'Physical': 1, 'Note': 1}
+# Weight of a token that only starts with the last term of a query, relative to an exact match
+PREFIX_WEIGHT = 0.5
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits a text into folded tokens
+    :param text: The text to split
+    :return: List of tokens, e.g. ['ray', 'allen', 'gmail', 'com'] for "Ray.Allen@gmail.com"
+    """
+    return _TOKEN.findall(fold(text))
+
+
+class SearchIndex:
+    """
+    SearchIndex:
+        Inverted index of the contacts, updated one value at a time. A query matches the contacts
+        that have every one of its terms, the last term also matching the tokens it starts with so
+        that results can be shown as the user types. Contacts are ranked by the sum of the weights
+        of their matching tokens, each multiplied by how rare the token is (its idf).
+
+    === Public Attributes ===
+    postings: Dictionary of token -> dictionary of name -> weight of the token for that contact
+    vocabulary: Sorted list of the tokens, to find the tokens starting with a prefix
+
+    === Methods ===
+    reset: Replaces everything in the index
+    add: Indexes the name & every value of a contact
+    remove: Removes the name & every value of a contact from the index
+    change: Updates the index after one value of a contact was added, changed or removed
+    search: Returns the names of the contacts matching a query, best first
+    """
+
+    def __init__(self, names=(), entries=()) -> None:
+        self.postings = {}
+        self.vocabulary = []
+        self.__count = 0
+        self.reset(names, entries)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def reset(self, names, entries) -> None:
+        """
+        Replaces everything in the index
+        :param names: Iterable of the names of the contacts
+        :param entries: Iterable of (name, kind, value), as returned by the entries of a store
+        :return: None
+        """
+        self.postings = {}
+        self.vocabulary = []
+        self.__count = 0
+        for name in names:
+            self.__index(name, WEIGHTS['Name'], name)
+            self.__count += 1
+        for name, kind, value in entries:
+            if kind in WEIGHTS:
+                self.__index(value, WEIGHTS[kind], name)
+        self.vocabulary = sorted(self.postings)
+
+    def add(self, name: str, contact) -> None:
+        self.change(name, 'Name', None, name)
+        for kind, value in contact.entries():
+            self.change(name, kind, None, value)
+
+    def remove(self, name: str, contact) -> None:
+        self.change(name, 'Name', name, None)
+        for kind, value in contact.entries():
+            self.change(name, kind, value, None)
+
+    def change(self, name: str, kind: str, old, new) -> None:
+        """
+        Updates the index after one value of a contact was added, changed or removed
+        :param name: Name of the contact
+        :param kind: Name, Home, Work or Personal for phone numbers, Email, Physical or Note; phone
+            numbers aren't indexed
+        :param old: Value before the change, or None if the value was added
+        :param new: Value after the change, or None if the value was removed
+        :return: None
+        """
+        if kind not in WEIGHTS:
+            return
+        if old is not None:
+            self.__index(old, -WEIGHTS[kind], name, update_vocabulary=True)
+            if kind == 'Name':
+                self.__count -= 1
+        if new is not None:
+            self.__index(new, WEIGHTS[kind], name, update_vocabulary=True)
+            if kind == 'Name':
+                self.__count += 1
+
+    def search(self, query: str, limit=None) -> list:
+        """
+        Returns the names of the contacts matching a query
+        :param query: Terms separated by spaces or punctuation; the last term is also matched as a
+            prefix, unless the query ends with a space
+        :param limit: Maximum number of names to return; all of them if None
+        :return: List of names, best match first; ties are ordered by name
+        """
+        terms = tokenize(query)
+        if len(terms) == 0:
+            return []
+        prefix = not query[-1:].isspace()
+
+        scores = None
+        # Rarest terms first, so that the candidates are pruned as early as possible
+        matches = [self.__match(term, prefix and index == len(terms) - 1)
+                   for index, term in enumerate(terms)]
+        for term_scores in sorted(matches, key=len):
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {name: score + term_scores[name] for name, score in scores.items()
+                          if name in term_scores}
+            if len(scores) == 0:
+                return []
+
+        ranked = ((-score, name) for name, score in scores.items())
+        if limit is None:
+            return [name for _, name in sorted(ranked)]
+        return [name for _, name in heapq.nsmallest(limit, ranked)]
+
+    def __match(self, term: str, prefix: bool) -> dict:
+        """
+        Scores the contacts matching one term
+        :param term: A folded token
+        :param prefix: Also matches the tokens starting with term if True
+        :return: Dictionary of name -> score
+        """
+        tokens = [term] if term in self.postings else []
+        if prefix:
+            index = bisect_left(self.vocabulary, term)
+            while index < len(self.vocabulary) and self.vocabulary[index].startswith(term):
+                if self.vocabulary[index] != term:
+                    tokens.append(self.vocabulary[index])
+                index += 1
+
+        scores = {}
+        for token in tokens:
+            postings = self.postings[token]
+            weight = math.log(1 + self.__count / len(postings))
+            if token != term:
+                weight *= PREFIX_WEIGHT
+            for name, count in postings.items():
+                scores[name] = scores.get(name, 0) + count * weight
+        return scores
+
+    def __index(self, text: str, weight: int, name: str, update_vocabulary=False) -> None:
+        for token in tokenize(text):
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = {}
+                if update_vocabulary:
+                    insort(self.vocabulary, token)
+            count = postings.get(name, 0) + weight
+            if count > 0:
+                postings[name] = count
+            else:
+                postings.pop(name, None)
+                if len(postings) == 0:
+                    del self.postings[token]
+                    if update_vocabulary:
+                        del self.vocabulary[bisect_left(self.vocabulary, token)]
@@ -0,0 +1,198 @@
+import random
+import string
+from typing import List, Optional, Sequence, Tuple
+from project.contact import Contact, PHONE_TYPES
+from project.ContactBook.contact_book import ContactBook
+from project.ContactBook.contact_import import ContactImport, import_contacts
+from project.ContactBook.contact_order import fold
+from project.ContactBook.journal_store import JournalStore
+from project.ContactBook.sqlite_store import SQLiteStore
+
+"""
+Everything the pages of the app do with the contacts, without Tk, so that it can also be used by
+batch jobs, worker processes & the benchmarks. The pages only turn clicks into calls of a
+ContactService & show what it returns.
+"""
+# Fields of a contact the wheel can land on
+WHEEL_FIELDS = ['Name', 'Home Phone Numbers', 'Work Phone Numbers', 'Personal Phone Numbers',
+                'Emails', 'Home Addresses', 'Notes']
+# Field of the wheel -> kind of value of Contact.entries
+FIELD_KINDS = {'Home Phone Numbers': 'Home', 'Work Phone Numbers': 'Work',
+               'Personal Phone Numbers': 'Personal', 'Emails': 'Email',
+               'Home Addresses': 'Physical', 'Notes': 'Note'}
+# Heading of every kind of value in the preview, after the phone numbers
+PREVIEW_HEADINGS = [('Email', "Emails:"), ('Physical', "Addresses:"), ('Note', "Notes:")]
+
+
+def open_book(store_type="journal") -> ContactBook:
+    """
+    Makes a ContactBook over the default files of a store; the contacts aren't loaded yet
+    :param store_type: "journal" for project/contacts_pickle or "sqlite" for project/contacts.db
+    :return: The ContactBook
+    """
+    return ContactBook(SQLiteStore() if store_type == "sqlite" else JournalStore())
+
+
+class ContactService:
+    """
+    ContactService:
+        Headless API of the contact manager over a ContactBook. Views that need to follow the
+        changes subscribe to the events of book.
+
+    === Public Attributes ===
+    book: The ContactBook
+    alphabetical_order: The 26 lowercase letters, in the order the names are sorted with
+
+    === Methods ===
+    get: Returns the contact with a given name
+    add: Adds a new contact, unless one of its phone numbers or emails belongs to another contact
+    delete: Deletes a contact
+    rename: Changes the name of a contact
+    load: Loads the contacts from the store
+    save: Saves the changes in the store
+    has_unsaved_changes: Returns whether some changes aren't saved yet
+    import_file: Imports the contacts of a CSV or vCard file
+    start_import: Prepares the import of a CSV or vCard file, to be run one batch at a time
+    shuffle_order: Randomizes the alphabetical order
+    order_contact: Returns every name in the alphabetical order
+    letters: Returns the letters of the alphabetical order, as shown next to the names
+    visible_names: Returns the names to show for a search
+    letter_index: Returns the index of the first name starting with a letter in the names shown
+    describe: Returns the text shown when the wheel lands on a field of a contact
+    preview_lines: Returns the lines of the preview of a contact being created
+    """
+    book: ContactBook
+    alphabetical_order: List[str]
+
+    def __init__(self, book: ContactBook) -> None:
+        self.book = book
+        self.alphabetical_order = list(string.ascii_lowercase)
+
+    def get(self, name: str) -> Contact:
+        return self.book.get(name)
+
+    def add(self, contact: Contact) -> List[Tuple[str, str, str]]:
+        """
+        Adds a new contact, unless one of its phone numbers or emails belongs to another contact
+        :param contact: The contact; a contact with the same name is replaced
+        :return: List of (kind, value, name of the other contact) of the values used by other
+            contacts; the contact was only added if it is empty
+        """
+        duplicates = self.book.duplicates(contact)
+        if len(duplicates) == 0:
+            self.book.add(contact)
+        return duplicates
+
+    def delete(self, name: str) -> None:
+        self.book.delete(name)
+
+    def rename(self, name: str, new_name: str) -> None:
+        self.book.rename(name, new_name)
+
+    def load(self) -> None:
+        self.book.load()
+
+    def save(self) -> None:
+        self.book.save()
+
+    def has_unsaved_changes(self) -> bool:
+        return self.book.has_unsaved_changes()
+
+    def import_file(self, path: str,
+                    file_format: Optional[str] = None) -> Tuple[int, list, float]:
+        """
+        Imports the contacts of a file in batches
+        :param path: Path of the CSV or vCard file
+        :param file_format: 'csv' or 'vcard'; guessed from the extension of path if None
+        :return: Tuple of the number of contacts imported, the list of (name, duplicates) of the
+            contacts skipped because a phone number or an email belongs to another contact, & the
+            records per second
+        """
+        return import_contacts(self.book, path, file_format)
+
+    def start_import(self, path: str, file_format: Optional[str] = None) -> ContactImport:
+        """
+        Prepares the import of a file; nothing is imported until step is called on the result
+        :param path: Path of the CSV or vCard file
+        :param file_format: 'csv' or 'vcard'; guessed from the extension of path if None
+        :return: The ContactImport
+        """
+        return ContactImport(self.book, path, file_format)
+
+    def shuffle_order(self) -> None:
+        random.shuffle(self.alphabetical_order)
+
+    def order_contact(self) -> List[str]:
+        """
+        Returns every name in the alphabetical order; see contact_order for how digits, spaces &
+            other characters are ordered
+        :return: The ordered list, shared with the book; it must not be modified
+        """
+        return self.book.order(self.alphabetical_order)
+
+    def letters(self) -> List[str]:
+        return [letter.upper() for letter in self.alphabetical_order]
+
+    def visible_names(self, query: str) -> List[str]:
+        """
+        Returns the names to show for a search
+        :param query: Text of the search
+        :return: Every name in the alphabetical order if query is blank, else the names of the
+            contacts matching it, best match first, or the closest names if none match
+        """
+        if query.strip() == '':
+            return self.order_contact()
+        names = self.book.search(query)
+        if len(names) == 0:
+            # Nothing matches; the name may be misspelled
+            names = [name for name, _ in self.book.fuzzy_find(query)]
+        return names
+
+    def letter_index(self, letter: str, names: Sequence[str], query: str) -> Optional[int]:
+        """
+        Returns the index of the first name starting with a letter
+        :param letter: The letter
+        :param names: The names shown, as returned by visible_names
+        :param query: Text of the search names were returned for
+        :return: The index in names, or None if no name starts with letter
+        """
+        if query.strip() == '':
+            return self.book.find(self.alphabetical_order, letter)
+        # The search results are ranked, so the first name starting with letter can be anywhere
+        return next((index for index, name in enumerate(names)
+                     if fold(name).startswith(fold(letter))), None)
+
+    @staticmethod
+    def describe(contact: Contact, field: str) -> str:
+        """
+        Returns the text shown when the wheel lands on a field of a contact
+        :param contact: The contact
+        :param field: One of WHEEL_FIELDS
+        :return: The name of the contact & the values of the field
+        """
+        text = contact.name + "'s " + field.lower() + ':\n'
+        if field == 'Name':
+            return text + contact.name
+        return text + ''.join(value + ', ' for kind, value in contact.entries()
+                              if kind == FIELD_KINDS.get(field))
+
+    @staticmethod
+    def preview_lines(contact: Contact) -> List[str]:
+        """
+        Returns the lines of the preview of a contact being created
+        :param contact: The contact
+        :return: The name, followed by the phone numbers, emails, addresses & notes under a heading
+            for each kind that has values
+        """
+        lines = [contact.name, ""]
+        entries = list(contact.entries())
+        phone_numbers = [(kind, value) for kind, value in entries if kind in PHONE_TYPES]
+        if len(phone_numbers) > 0:
+            lines.append("Phone:")
+            lines.extend("   " + kind + ": " + number for kind, number in phone_numbers)
+        for heading_kind, heading in PREVIEW_HEADINGS:
+            values = [value for kind, value in entries if kind == heading_kind]
+            if len(values) > 0:
+                lines.append(heading)
+                lines.extend("   " + value for value in values)
+        return lines
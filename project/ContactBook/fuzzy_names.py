@@ -0,0 +1,150 @@
+from array import array
+from bisect import insort
+import numpy as np
+from project.ContactBook.contact_order import fold
+
+"""
+Typo tolerant lookup of the names of the contacts. Names are folded like they are for ordering &
+split into trigrams, every word padded like "  word ", so that "charlote" shares most of its
+trigrams with "charlott". A name within k edits of a query shares at least (trigrams of the
+query - 3k) trigrams with it, since editing a letter changes at most 3 trigrams; only the names
+sharing that many trigrams are compared with the query.
+"""
+
+
+def trigrams(text: str) -> set:
+    """
+    Returns the trigrams of a folded text
+    :param text: The folded text
+    :return: Set of trigrams, e.g. {'  a', ' an', 'ann', 'nn '} for "ann"
+    """
+    grams = set()
+    for word in text.split():
+        padded = '  ' + word + ' '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def edit_distance(first: str, second: str, bound: int) -> int:
+    """
+    Levenshtein distance between two strings, giving up once it is known to exceed a bound
+    :param first: The first string
+    :param second: The second string
+    :param bound: Largest distance of interest
+    :return: The distance, or bound + 1 if it is larger than bound
+    """
+    if abs(len(first) - len(second)) > bound:
+        return bound + 1
+    previous = list(range(len(second) + 1))
+    for i, character in enumerate(first, 1):
+        current = [i]
+        for j, other in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (character != other)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+
+class TrigramIndex:
+    """
+    TrigramIndex:
+        Trigram index of names. Every name gets an id; the postings of a trigram are a compact
+        array of the ids of the names that have it, so that the shared trigrams of every name are
+        counted at once with numpy. Removed names leave a hole that is reclaimed once half of the
+        ids are holes.
+
+    === Public Attributes ===
+    max_distance: Largest number of edits between a query & the names it finds
+
+    === Methods ===
+    reset: Replaces all the names
+    add: Adds a name
+    remove: Removes a name
+    find: Returns the names closest to a query
+    """
+
+    def __init__(self, names=(), max_distance=2) -> None:
+        self.max_distance = max_distance
+        # id -> name, or None once removed
+        self.__names = []
+        self.__folded = []
+        self.__ids = {}
+        # trigram -> array of ids
+        self.__postings = {}
+        self.reset(names)
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def reset(self, names) -> None:
+        self.__names = []
+        self.__folded = []
+        self.__ids = {}
+        self.__postings = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        if name in self.__ids:
+            return
+        name_id = len(self.__names)
+        self.__ids[name] = name_id
+        self.__names.append(name)
+        self.__folded.append(fold(name))
+        for gram in trigrams(self.__folded[name_id]):
+            postings = self.__postings.get(gram)
+            if postings is None:
+                postings = self.__postings[gram] = array('I')
+            postings.append(name_id)
+
+    def remove(self, name: str) -> None:
+        name_id = self.__ids.pop(name, None)
+        if name_id is None:
+            return
+        # The postings still have the id; they are cleaned up when the index is rebuilt
+        self.__names[name_id] = None
+        self.__folded[name_id] = None
+        if len(self.__ids) < len(self.__names) // 2:
+            self.reset(list(self.__ids))
+
+    def find(self, query: str, limit=5) -> list:
+        """
+        Returns the names closest to a query; a query of a single word is also compared with every
+            word of the names, so "bledso" finds "Charlott Bledsoe"
+        :param query: The name, or part of the name, to look for
+        :param limit: Maximum number of names to return
+        :return: List of (name, number of edits), closest first
+        """
+        folded = ' '.join(fold(query).split())
+        query_grams = trigrams(folded)
+        grams = [gram for gram in query_grams if gram in self.__postings]
+        if len(grams) == 0:
+            return []
+        bound = min(self.max_distance, len(folded) // 4)
+        threshold = max(1, len(query_grams) - 3 * bound)
+
+        counts = np.bincount(np.concatenate([np.frombuffer(self.__postings[gram], dtype=np.uint32)
+                                             for gram in grams]), minlength=len(self.__names))
+        candidates = np.flatnonzero(counts >= threshold)
+        # Names sharing the most trigrams first; a name sharing count trigrams is at least
+        # (trigrams of the query - count) / 3 edits away, so the search stops once limit names are
+        # at least as close as that
+        candidates = candidates[np.argsort(-counts[candidates], kind='stable')]
+        single_word = ' ' not in folded
+        best = []
+        for name_id, count in zip(candidates.tolist(), counts[candidates].tolist()):
+            if len(best) == limit and best[-1][0] <= -(-(len(query_grams) - count) // 3):
+                break
+            name = self.__names[name_id]
+            if name is None:
+                continue
+            distance = edit_distance(folded, self.__folded[name_id], bound)
+            if single_word and distance > 0:
+                for word in self.__folded[name_id].split():
+                    distance = min(distance, edit_distance(folded, word, bound))
+            if distance <= bound:
+                insort(best, (distance, name))
+                del best[limit:]
+        return [(name, distance) for distance, name in best]
@@ -0,0 +1,190 @@
+import os
+import pickle
+import shutil
+import threading
+
+
+class JournalStore:
+    """
+    JournalStore:
+        Saves the contacts as a snapshot followed by an append-only journal of the changes made
+        since the snapshot. Saving only appends the changes recorded since the last save; once the
+        journal gets long it is compacted into a new snapshot in a background thread.
+        The snapshot has the same format as the pickle made by create_contact_list_pickle:
+        {name: Contact, ...}
+
+    === Public Attributes ===
+    contacts: Dictionary of contacts, each key is the name of the contact; it must only be changed
+        through add, update & delete
+    snapshot_path: Path of the snapshot pickle
+    journal_path: Path of the journal; each entry is a pickled tuple (operation, name, contact)
+    compact_every: Number of journal entries after which the journal is compacted
+    loaded: Whether load was called; until then contacts only holds the changes made since the
+        store was opened, so saves only append to the journal & nothing is compacted
+
+    === Methods ===
+    load: Returns the contacts of the snapshot with the journal replayed on top of it
+    add: Adds a contact & records the change
+    update: Replaces a contact & records the change
+    delete: Deletes a contact & records the change
+    entries: Iterates over every phone number, email, address & note of the contacts
+    get_many: Returns many contacts at once
+    has_unsaved_changes: Returns whether changes were recorded since the last save
+    save: Appends the recorded changes to the journal and compacts it if needed
+    compact: Writes a new snapshot in the background and empties the journal
+    wait: Waits for the background compaction to finish
+    """
+
+    def __init__(self, snapshot_path="project/contacts_pickle",
+                 journal_path="project/contacts_journal", compact_every=1000) -> None:
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compact_every = compact_every
+        self.contacts = {}
+        self.loaded = False
+
+        self.__pending = []
+        self.__journal_length = 0
+        self.__compaction = None
+
+    def load(self) -> dict:
+        """
+        Loads the snapshot & replays the journal; the changes recorded since the last save are
+            discarded
+        :return: Dictionary of contacts, each key is the name of the contact
+        """
+        self.wait()
+        self.__pending = []
+        self.contacts = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as infile:
+                self.contacts = pickle.load(infile)
+
+        # A rotated journal is only left behind if a compaction was interrupted
+        self.__journal_length = 0
+        for path in [self.__rotated_path(), self.journal_path]:
+            self.__journal_length += self.__replay(path, self.contacts)
+        self.loaded = True
+        return self.contacts
+
+    def add(self, contact) -> None:
+        self.contacts[contact.name] = contact
+        self.__pending.append(('add', contact.name, contact))
+
+    def update(self, contact) -> None:
+        self.contacts[contact.name] = contact
+        self.__pending.append(('update', contact.name, contact))
+
+    def delete(self, name: str) -> None:
+        del self.contacts[name]
+        self.__pending.append(('delete', name, None))
+
+    def entries(self):
+        """
+        Iterates over every value of the contacts
+        :return: Iterator of (name, kind, value), with the kinds of Contact.entries
+        """
+        for name, contact in self.contacts.items():
+            for kind, value in contact.entries():
+                yield name, kind, value
+
+    def get_many(self, names: list) -> list:
+        return [self.contacts[name] for name in names]
+
+    def has_unsaved_changes(self) -> bool:
+        return len(self.__pending) > 0
+
+    def save(self, compact=True) -> None:
+        """
+        Appends the changes recorded since the last save to the journal
+        :param compact: Compacts the journal if it is long enough when True; bulk writers pass
+            False for every batch & compact once at the end, with a last save. A store that
+            isn't loaded is never compacted.
+        :return: None
+        """
+        if len(self.__pending) > 0:
+            with open(self.journal_path, 'ab') as outfile:
+                for entry in self.__pending:
+                    pickle.dump(entry, outfile)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            self.__journal_length += len(self.__pending)
+            self.__pending = []
+
+        if compact and self.loaded and (self.__journal_length >= self.compact_every or
+                                        not os.path.exists(self.snapshot_path)):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Replaces the snapshot by the saved contacts & empties the journal. The journal is rotated
+            right away so later saves go to a new journal. The contacts are pickled right away too,
+            since they may be changed while the snapshot is written; only writing it to the disk is
+            done in a background thread. Nothing is done if a compaction is already running, or if
+            the store isn't loaded: the snapshot must never be replaced by the few contacts changed
+            since the store was opened.
+        :return: None
+        """
+        if not self.loaded:
+            return
+        if self.__compaction is not None and self.__compaction.is_alive():
+            return
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.__rotated_path()):
+                # The last compaction failed; its journal is kept until a snapshot is written
+                with open(self.journal_path, 'rb') as infile, \
+                        open(self.__rotated_path(), 'ab') as outfile:
+                    shutil.copyfileobj(infile, outfile)
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.__rotated_path())
+        self.__journal_length = 0
+        # Copying the dictionary wouldn't do: the contacts in it are the ones being edited
+        snapshot = pickle.dumps(self.contacts)
+        self.__compaction = threading.Thread(target=self.__write_snapshot, args=(snapshot,))
+        self.__compaction.start()
+
+    def wait(self) -> None:
+        if self.__compaction is not None:
+            self.__compaction.join()
+
+    def __write_snapshot(self, snapshot: bytes) -> None:
+        temporary_path = self.snapshot_path + '.tmp'
+        with open(temporary_path, 'wb') as outfile:
+            outfile.write(snapshot)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        if os.path.exists(self.__rotated_path()):
+            os.remove(self.__rotated_path())
+
+    def __rotated_path(self) -> str:
+        return self.journal_path + '.old'
+
+    @staticmethod
+    def __replay(path, contacts: dict) -> int:
+        """
+        Applies every entry of a journal to contacts; an entry that was only partly written is
+            ignored & cut from the journal so that later entries can be appended after it
+        :param path: Path of the journal
+        :param contacts: Dictionary of contacts to update
+        :return: Number of entries applied
+        """
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, 'r+b') as infile:
+            end = 0
+            while True:
+                try:
+                    operation, name, contact = pickle.load(infile)
+                except (EOFError, ValueError, pickle.UnpicklingError):
+                    break
+                if operation == 'delete':
+                    contacts.pop(name, None)
+                else:
+                    contacts[name] = contact
+                count += 1
+                end = infile.tell()
+            infile.truncate(end)
+        return count
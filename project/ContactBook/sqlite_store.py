@@ -0,0 +1,247 @@
+import sqlite3
+from collections.abc import Mapping
+from project.contact import Contact
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS phone_numbers (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    number TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS emails (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    address TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS addresses (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    address TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    note TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS phone_numbers_contact ON phone_numbers(contact_id, position);
+CREATE INDEX IF NOT EXISTS emails_contact ON emails(contact_id, position);
+CREATE INDEX IF NOT EXISTS addresses_contact ON addresses(contact_id, position);
+CREATE INDEX IF NOT EXISTS notes_contact ON notes(contact_id, position);
+"""
+# Scripts that bring a database made by an older version up to date; a database runs the ones
+# after its user_version once, then its user_version is set to the number of migrations
+MIGRATIONS = [
+    # 1: Values are looked up in the ContactIndex of the book; indexes on them only slowed down
+    # writes
+    """
+    DROP INDEX IF EXISTS phone_numbers_number;
+    DROP INDEX IF EXISTS emails_address;
+    DROP INDEX IF EXISTS addresses_address;
+    """,
+]
+
+
+class SQLiteContacts(Mapping):
+    """
+    SQLiteContacts:
+        Read-only mapping of name -> Contact backed by the database; contacts are only read when
+        they are accessed, so their bodies are never held in memory as a whole. Iterating over it
+        pages through the names.
+
+    === Public Attributes ===
+    connection: Connection to the database
+
+    === Methods ===
+    get_many: Reads many contacts at once
+    """
+
+    def __init__(self, connection: sqlite3.Connection, page_size=1000) -> None:
+        self.connection = connection
+        self.__page_size = page_size
+
+    def __getitem__(self, name: str) -> Contact:
+        row = self.connection.execute("SELECT id FROM contacts WHERE name = ?",
+                                      (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        contact_id = row[0]
+
+        contact = Contact(name)
+        for num_type, number in self.connection.execute(
+                "SELECT type, number FROM phone_numbers WHERE contact_id = ? ORDER BY position",
+                (contact_id,)):
+            contact.append_phone_number(num_type, number)
+        for table, column, attribute in [('emails', 'address', 'email_addresses'),
+                                         ('addresses', 'address', 'addresses'),
+                                         ('notes', 'note', 'notes')]:
+            values = [value for value, in self.connection.execute(
+                "SELECT {} FROM {} WHERE contact_id = ? ORDER BY position".format(column, table),
+                (contact_id,))]
+            # Empty collections are left to be created by the contact when they're needed
+            if len(values) > 0:
+                setattr(contact, attribute, values)
+        return contact
+
+    def get_many(self, names: list) -> list:
+        """
+        Reads many contacts with one query per table, instead of one query per table & contact
+        :param names: The names of the contacts; at most 500 of them, to stay under the limit of
+            SQLite on the number of parameters of a query
+        :return: List of Contacts, in the same order as names
+        """
+        placeholders = ', '.join('?' * len(names))
+        by_name = {}
+        by_id = {}
+        for contact_id, name in self.connection.execute(
+                "SELECT id, name FROM contacts WHERE name IN ({})".format(placeholders), names):
+            by_name[name] = by_id[contact_id] = Contact(name)
+        placeholders = ', '.join('?' * len(by_id))
+        ids = list(by_id)
+
+        for contact_id, num_type, number in self.connection.execute(
+                "SELECT contact_id, type, number FROM phone_numbers WHERE contact_id IN ({}) "
+                "ORDER BY contact_id, position".format(placeholders), ids):
+            by_id[contact_id].append_phone_number(num_type, number)
+        for table, column, attribute in [('emails', 'address', 'email_addresses'),
+                                         ('addresses', 'address', 'addresses'),
+                                         ('notes', 'note', 'notes')]:
+            values = {}
+            for contact_id, value in self.connection.execute(
+                    "SELECT contact_id, {} FROM {} WHERE contact_id IN ({}) "
+                    "ORDER BY contact_id, position".format(column, table, placeholders), ids):
+                values.setdefault(contact_id, []).append(value)
+            for contact_id, contact_values in values.items():
+                setattr(by_id[contact_id], attribute, contact_values)
+        return [by_name[name] for name in names]
+
+    def __contains__(self, name) -> bool:
+        return self.connection.execute("SELECT 1 FROM contacts WHERE name = ?",
+                                       (name,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def __iter__(self):
+        last_id = 0
+        while True:
+            page = self.connection.execute(
+                "SELECT id, name FROM contacts WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, self.__page_size)).fetchall()
+            if len(page) == 0:
+                return
+            for _, name in page:
+                yield name
+            last_id = page[-1][0]
+
+
+class SQLiteStore:
+    """
+    SQLiteStore:
+        Saves the contacts in a SQLite database, with the names, phone numbers, emails, addresses &
+        notes normalized into indexed tables. Changes are written in a transaction that is
+        committed by save and rolled back by load.
+        Only the bodies of the contacts stay on the disk: the ContactBook still keeps every name in
+        its OrderingCache, which the contacts view is paged from, & every value in its indexes.
+        A database made by an older version is brought up to date with MIGRATIONS when it is opened.
+
+    === Public Attributes ===
+    path: Path of the database
+    connection: Connection to the database
+    contacts: SQLiteContacts mapping of the database; it must only be changed through add, update
+        & delete
+
+    === Methods ===
+    load: Discards the unsaved changes & returns the contacts
+    add: Adds a contact
+    update: Replaces a contact
+    delete: Deletes a contact
+    entries: Iterates over every phone number, email, address & note of the contacts
+    get_many: Reads many contacts at once
+    has_unsaved_changes: Returns whether there are changes that aren't committed yet
+    save: Commits the changes
+    close: Closes the database
+    """
+
+    def __init__(self, path="project/contacts.db") -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self.__migrate()
+        self.contacts = SQLiteContacts(self.connection)
+
+    def load(self) -> SQLiteContacts:
+        self.connection.rollback()
+        return self.contacts
+
+    def add(self, contact: Contact) -> None:
+        row = self.connection.execute("SELECT id FROM contacts WHERE name = ?",
+                                      (contact.name,)).fetchone()
+        if row is None:
+            contact_id = self.connection.execute("INSERT INTO contacts (name) VALUES (?)",
+                                                 (contact.name,)).lastrowid
+        else:
+            # The contact keeps its id, and so its place in the insertion order
+            contact_id = row[0]
+            for table in ['phone_numbers', 'emails', 'addresses', 'notes']:
+                self.connection.execute("DELETE FROM {} WHERE contact_id = ?".format(table),
+                                        (contact_id,))
+        self.connection.executemany(
+            "INSERT INTO phone_numbers (contact_id, position, type, number) VALUES (?, ?, ?, ?)",
+            [(contact_id, position, num_type, number)
+             for num_type in ['Home', 'Work', 'Personal']
+             for position, number in enumerate(contact.get_phone_numbers(num_type))])
+        for table, column, values in [('emails', 'address', contact.email_addresses),
+                                      ('addresses', 'address', contact.addresses),
+                                      ('notes', 'note', contact.notes)]:
+            self.connection.executemany(
+                "INSERT INTO {} (contact_id, position, {}) VALUES (?, ?, ?)".format(table, column),
+                [(contact_id, position, value) for position, value in enumerate(values)])
+
+    def update(self, contact: Contact) -> None:
+        self.add(contact)
+
+    def delete(self, name: str) -> None:
+        if self.connection.execute("DELETE FROM contacts WHERE name = ?",
+                                   (name,)).rowcount == 0:
+            raise KeyError(name)
+
+    def entries(self):
+        """
+        Iterates over every value of the contacts
+        :return: Iterator of (name, kind, value), with the kinds of Contact.entries
+        """
+        for kind, column, table in [('type', 'number', 'phone_numbers'),
+                                    ("'Email'", 'address', 'emails'),
+                                    ("'Physical'", 'address', 'addresses'),
+                                    ("'Note'", 'note', 'notes')]:
+            query = "SELECT name, {}, {} FROM {} JOIN contacts ON id = contact_id"
+            yield from self.connection.execute(query.format(kind, column, table))
+
+    def get_many(self, names: list) -> list:
+        return self.contacts.get_many(names)
+
+    def has_unsaved_changes(self) -> bool:
+        return self.connection.in_transaction
+
+    def save(self, compact=True) -> None:
+        # Every commit is incremental; compact is only there to match JournalStore.save
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __migrate(self) -> None:
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= len(MIGRATIONS):
+            return
+        for script in MIGRATIONS[version:]:
+            self.connection.executescript(script)
+        # PRAGMA doesn't take parameters; len(MIGRATIONS) is an int
+        self.connection.execute("PRAGMA user_version = {}".format(len(MIGRATIONS)))
+        self.connection.commit()
@@ -4,8 +4,29 @@ import time
 import math
 from project.MouseController import MouseController
 
+# Milliseconds between two frames of the animation, about 30 frames per second
+FRAME_TIME = 33
+
 
 class WheelSpinner(tk.Frame):
+    """
+    WheelSpinner:
+        Wheel the user drags & lets go of; it slows down until it lands on one of its options.
+        Frames are only scheduled while the wheel is dragged or rotating & the wheel can be seen;
+        otherwise no callback is pending, so an idle wheel costs nothing. A wheel hidden while it
+        rotates stops where it is & starts again when it is shown.
+
+    === Public Attributes ===
+    wheel_options: Texts of the slices of the wheel
+    winner: Text of the slice the last rotation landed on
+    is_rotating: True while the wheel turns by itself after being let go of
+
+    === Methods ===
+    draw: Draws the wheel, ready to be spun
+    erase: Removes the wheel
+    update: Draws one frame of the animation & schedules the next one if the wheel still moves
+    finish_rotation: Erases the wheel & sends <<Finish Spinning Wheel>> to the master
+    """
 
     def __init__(self, master, wheel_options, radius, *args, **kwargs):
         super().__init__(master, *args, **kwargs)
@@ -29,6 +50,8 @@ class WheelSpinner(tk.Frame):
 
         self.canvas.bind("<Button-1>", lambda event: self.verify_click_position(event))
         self.canvas.bind("<ButtonRelease-1>", lambda event: self.on_mouse_release(event))
+        # Sent when the canvas is shown again, e.g. when its tab is selected or the window restored
+        self.canvas.bind("<Visibility>", lambda event: self.__schedule_frame())
 
         self.__drawn = False
         self.__rotation_speed_list = []
@@ -36,12 +59,13 @@ class WheelSpinner(tk.Frame):
         self.__init_drag_pos = None
         self.__current_time = None
         self.__delta_time = None
+        # Id of the pending frame, or None when the animation is stopped
+        self.__frame_job = None
 
         self.__mouse_controller = MouseController(self.canvas)
 
-        self.update()
-
     def draw(self):
+        self.erase()
         self.display_label['text'] = "Spin the wheel to find out \nwhat information you'll see!"
         self.count = len(self.wheel_options)
         angle = 0
@@ -62,6 +86,7 @@ class WheelSpinner(tk.Frame):
 
     def erase(self):
         self.canvas.delete('all')
+        self.drawn_arc = []
 
     def display_current_winner(self):
         winner = None
@@ -72,13 +97,17 @@ class WheelSpinner(tk.Frame):
             self.display_label['text'] = winner
 
     def update(self):
-        if not self.__drawn:
-            self.after(33, self.update)
+        self.__frame_job = None
+        if not self.__is_moving() or not self.winfo_viewable():
+            # Stopped or hidden; the next frame is scheduled when the wheel moves or is shown again
+            self.__current_time = None
             return
+        now = time.time()
         if self.__current_time is None:
             self.__delta_time = 1 / 30
         else:
-            self.__delta_time = time.time() - self.__current_time
+            self.__delta_time = now - self.__current_time
+        self.__current_time = now
 
         if self.is_rotating:
             self.rotate_all_with_speed()
@@ -88,7 +117,18 @@ class WheelSpinner(tk.Frame):
         if self.__is_dragging:
             self.drag()
 
-        self.after(33, self.update)
+        self.__schedule_frame()
+
+    def __is_moving(self) -> bool:
+        return self.__drawn and (self.is_rotating or self.__is_dragging)
+
+    def __schedule_frame(self) -> None:
+        """
+        Schedules the next frame if the wheel moves & none is pending
+        :return: None
+        """
+        if self.__frame_job is None and self.__is_moving():
+            self.__frame_job = self.after(FRAME_TIME, self.update)
 
     def verify_click_position(self, event):
         if self.__is_dragging or self.is_rotating or not self.__drawn:
@@ -103,6 +143,7 @@ class WheelSpinner(tk.Frame):
             self.__is_dragging = True
             self.__rotation_speed_list = []
             self.__init_drag_pos = x, y
+            self.__schedule_frame()
 
     def drag(self):
         x0, y0 = self.__init_drag_pos
@@ -131,6 +172,7 @@ class WheelSpinner(tk.Frame):
             self.display_label['text'] = "SPIN HARDER!"
         else:
             self.is_rotating = True
+            self.__schedule_frame()
 
     def rotate_all(self, degree):
         for arc in self.drawn_arc:
@@ -172,8 +214,8 @@ class WheelSpinner(tk.Frame):
         self.is_rotating = False
         self.erase()
         self.__drawn = False
+        # The master shows the winner when it gets the event
         self.master.event_generate("<<Finish Spinning Wheel>>", when="tail")
-        self.master.show_winning_info()
 
     def __get_elapsed_time(self):
         """
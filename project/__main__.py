@@ -1,14 +1,18 @@
-import random
-from tkinter import Tk, Frame, Listbox, Button, Label, Scrollbar, VERTICAL, END, SINGLE, NONE, \
-    StringVar, Radiobutton, Toplevel, N, S, E, W
+import argparse
+import os
+from tkinter import Tk, Frame, Listbox, Button, Label, Entry, Scrollbar, VERTICAL, END, SINGLE, \
+    NONE, StringVar, Radiobutton, Toplevel, DISABLED, NORMAL, N, S, E, W
+from tkinter import filedialog, messagebox
 from tkinter.ttk import Notebook
 from project.contact import Contact
-import pickle
+from project.ContactBook.contact_service import ContactService, WHEEL_FIELDS, open_book
+from project.ContactBook.VirtualListbox import VirtualListbox
 from project.WheelSpinner.WheelSpinner import WheelSpinner
 from project.PhoneNumber.AddPhoneNumberInter import AddPhoneNumberInter
 from project.AlphabetGuesser.AlphabetGuesserInter import AlphabetGuesserInter
 from project.AlphabetGuesser.create_dictionary import create_dictionary
 from project.create_contact_list_pickle import main as create_contact_list
+from project.build_cache import cached_build
 
 
 class Controller(Tk):
@@ -23,13 +27,19 @@ class Controller(Tk):
     frames: Dictionary of all pages; allows for access of information across pages
             e.g. If I wanted to call a method from a separate class:
                 self.controller.frames[<name of page>].<method I want to call>()
+    store_type: Where the contacts are saved; either "journal" or "sqlite"
+    book: ContactBook shared by every page; pages subscribe to its events to update their views
+    service: ContactService over book; pages change the contacts through it
 
     === Methods ===
     None
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, store_type="journal", **kwargs):
         Tk.__init__(self, *args, **kwargs)
+        self.store_type = store_type
+        self.book = open_book(store_type)
+        self.service = ContactService(self.book)
         self.resizable(False, False)
         self.geometry("300x400")
         self.title("Contact Manager")
@@ -67,14 +77,19 @@ class ContactsPage(Frame):
     page_name: String containing a name for this page; used for setting the tabs
                 in the containing notebook
 
-    contacts_list: Dictionary of contacts, each contact is a Contact class instance,
-                    each key is the name of the contact
+    book: The controller's ContactBook; the contacts field is updated one row at a time from its
+            events
+    service: The controller's ContactService, which does everything the page asks of the contacts
     current_contact: Contains the contact that was selected the last time we clicked on show info.
 
+    search_text: StringVar of the search entry; while it isn't blank, contacts_field only shows the
+                contacts matching it, best match first, or the closest names if none match
+    search_entry: Entry in which the user types a search; the contacts are filtered as they type
     scroll_bar: Scroll bar that controls what is viewable in the contacts list;
                 won't scroll if nothing is in the list, or everything is already
                 shown.
-    contacts_field: Area where contacts are shown; 10 at a time
+    contacts_field: VirtualListbox where contacts are shown; only the visible names are inserted in
+                    it
     letters_field: Listbox that shows each letter of the alphabet to help the user find
                     contact they're looking for
     show_info: Button that updates the info_field with the information of the
@@ -86,17 +101,31 @@ class ContactsPage(Frame):
                     scroll if nothing is in the list, or everything is already shown
 
     self.load: Button to load contacts
+    self.import_button: Button to import contacts from a CSV or vCard file; disabled until the
+                contacts are loaded, so that the import is checked against every contact
     self.save: Button to save contacts
 
     === Methods ===
     create: Initializes objects & places them on the page
-    insert_contact: Adds a contact's name to the end of the contacts field
     show_contact_info: Shows the information of the selected contact in the info listbox
-    delete_contact: Deletes the selected contact & reloads the contacts Listbox
+    delete_contact: Deletes the selected contact
+    on_contact_added: Inserts the row of a new contact in the contacts field
+    on_contact_removed: Removes the row of a deleted contact from the contacts field
+    on_contact_renamed: Moves the row of a renamed contact in the contacts field
+    on_contact_updated: Searches again if the contacts are filtered, since the contact may not
+        match anymore
     clear_fields: Clears both fields on the contacts page
-    load_contacts: Loads contacts in from a file
-    save_contacts: Saves contacts as a file
-    yview: Adjusts the view of contacts_field & letters_field at the same time
+    refresh_fields: Shows the contacts in the current alphabetical order, or the contacts matching
+        the search, along with the letters
+    schedule_refresh: Asks for refresh_fields to run once Tk is idle; requests made before it runs
+        are merged into a single refresh
+    load_contacts: Loads contacts in from the store
+    on_contacts_loaded: Enables the import, shows the loaded contacts & starts building the
+        index of the misspelled searches in the background
+    import_file: Asks for a CSV or vCard file & imports its contacts one batch at a time
+    save_contacts: Saves the changes made to the contacts in the store
+    yview: Adjusts the view of contacts_field; letters_field follows it
+    on_contacts_scroll: Updates scroll_bar & letters_field to the current view of contacts_field
     on_mouse_wheel: Adjusts the view of contacts_field and letters_field at the same time, for the
         mouse wheel
     """
@@ -109,11 +138,12 @@ class ContactsPage(Frame):
         self.page_name = "View Contacts"
 
         # Initialize object names
-        self.contacts_list = {}
+        self.book = controller.book
+        self.service = controller.service
         self.current_contact = None
-        self.alphabetical_order = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm',
-                                   'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
 
+        self.search_text = None
+        self.search_entry = None
         self.scroll_bar = None
         self.contacts_field = None
         self.letters_field = None
@@ -126,11 +156,24 @@ class ContactsPage(Frame):
         self.bind("<<Finish Spinning Wheel>>", self.show_winning_info)
         self.bind("<Visibility>", self.__on_visibility)
 
+        self.__pending_refresh = None
+        self.__pending_shuffle = False
+        # ContactImport being run, one batch per Tk callback
+        self.__import = None
+
         self.load = None
+        self.import_button = None
         self.save = None
 
         self.create()
 
+        self.book.subscribe('added', self.on_contact_added)
+        self.book.subscribe('removed', self.on_contact_removed)
+        self.book.subscribe('renamed', self.on_contact_renamed)
+        self.book.subscribe('updated', self.on_contact_updated)
+        self.book.subscribe('loaded', self.on_contacts_loaded)
+        self.book.subscribe('imported', lambda count: self.schedule_refresh())
+
     def create(self) -> None:
         self.info_scroll = Scrollbar(self, orient=VERTICAL)
         self.info_field = Listbox(
@@ -139,20 +182,23 @@ class ContactsPage(Frame):
         )
 
         self.delete = Button(self, text="Delete", command=lambda: self.delete_contact())
-        self.delete.grid(row=2, column=3, columnspan=3, sticky=N + S + E + W)
+        self.delete.grid(row=3, column=3, columnspan=3, sticky=N + S + E + W)
 
         self.show_info = Button(self, text="Show Info", command=lambda: self.show_contact_info())
-        self.show_info.grid(row=2, column=0, columnspan=3, sticky=N + S + E + W)
+        self.show_info.grid(row=3, column=0, columnspan=3, sticky=N + S + E + W)
+
+        self.wheel_spin = WheelSpinner(self, WHEEL_FIELDS, width=50, height=200, radius=60)
+        self.wheel_spin.grid(row=4, column=0, columnspan=5)
 
-        wheel_spin_options = ['Name', 'Home Phone Numbers', 'Work Phone Numbers',
-                              'Personal Phone Numbers', 'Emails', 'Home Addresses', 'Notes']
-        self.wheel_spin = WheelSpinner(self, wheel_spin_options, width=50, height=200, radius=60)
-        self.wheel_spin.grid(row=3, column=0, columnspan=5)
+        self.search_text = StringVar()
+        self.search_text.trace_add('write', lambda *args: self.schedule_refresh())
+        self.search_entry = Entry(self, textvariable=self.search_text)
+        self.search_entry.grid(row=1, column=0, columnspan=6, sticky=N + S + E + W)
 
         self.scroll_bar = Scrollbar(self)
-        self.contacts_field = Listbox(
+        self.contacts_field = VirtualListbox(
             self,
-            yscrollcommand=self.scroll_bar.set,
+            yscrollcommand=self.on_contacts_scroll,
             selectmode=SINGLE,
             exportselection=0
         )
@@ -164,9 +210,9 @@ class ContactsPage(Frame):
         )
 
         self.letters_field.bind('<<ListboxSelect>>', self.scroll_to_letter)
-        self.contacts_field.grid(row=1, column=0, columnspan=5, sticky=N + S + E + W)
-        self.letters_field.grid(row=1, column=4, sticky=N + S + E + W)
-        self.scroll_bar.grid(row=1, column=5, sticky=N + S + E + W)
+        self.contacts_field.grid(row=2, column=0, columnspan=5, sticky=N + S + E + W)
+        self.letters_field.grid(row=2, column=4, sticky=N + S + E + W)
+        self.scroll_bar.grid(row=2, column=5, sticky=N + S + E + W)
         self.scroll_bar.config(command=self.yview)
         self.contacts_field.bind("<MouseWheel>", self.on_mouse_wheel)
         self.letters_field.bind("<MouseWheel>", self.on_letter_mouse_wheel)
@@ -176,31 +222,37 @@ class ContactsPage(Frame):
             text="Save Contacts",
             command=lambda: self.save_contacts()
         )
-        self.save.grid(row=0, column=3, columnspan=4, sticky=N + S + E + W)
+        self.save.grid(row=0, column=4, columnspan=2, sticky=N + S + E + W)
+
+        self.import_button = Button(
+            self,
+            text="Import",
+            state=DISABLED,
+            command=lambda: self.import_file()
+        )
+        self.import_button.grid(row=0, column=2, columnspan=2, sticky=N + S + E + W)
 
         self.load = Button(
             self,
             text="Load Contacts",
             command=lambda: self.load_contacts()
         )
-        self.load.grid(row=0, column=0, columnspan=3, sticky=N + S + E + W)
+        self.load.grid(row=0, column=0, columnspan=2, sticky=N + S + E + W)
 
-        for i in range(3):
+        for i in [0, 2, 3]:
             self.grid_rowconfigure(i, weight=1)
 
         for i in range(4):
             self.grid_columnconfigure(i, weight=1)
 
     def scroll_to_letter(self, event):
-        id = 0
-        for contact in self.order_contact():
-            if contact[0] == self.letters_field.get(self.letters_field.curselection()[0]):
-                self.contacts_field.see(id)
-                self.contacts_field.selection_clear(0, END)
-                self.contacts_field.selection_set(id)
-                self.letters_field.selection_clear(0, END)
-                return
-            id += 1
+        letter = self.letters_field.get(self.letters_field.curselection()[0])
+        index = self.service.letter_index(letter, self.contacts_field.model,
+                                          self.search_text.get())
+        if index is not None:
+            self.contacts_field.see(index)
+            self.contacts_field.selection_clear(0, END)
+            self.contacts_field.selection_set(index)
         self.letters_field.selection_clear(0, END)
 
     def on_mouse_wheel(self, event) -> str:
@@ -213,39 +265,138 @@ class ContactsPage(Frame):
 
     def yview(self, *args) -> None:
         self.contacts_field.yview(*args)
-        self.letters_field.yview(*args)
+
+    def on_contacts_scroll(self, first, last) -> None:
+        self.scroll_bar.set(first, last)
+        self.letters_field.yview_moveto(first)
 
     def delete_contact(self) -> None:
         name = self.contacts_field.get(self.contacts_field.curselection()[0])
-        del self.contacts_list[name]
-        self.clear_fields()
-        for contact in sorted(self.contacts_list):
-            self.insert_contact(contact)
+        self.service.delete(name)
+
+    def on_contact_added(self, name) -> None:
+        ordering = self.book.ordering(self.service.alphabetical_order)
+        if ordering.names is not self.contacts_field.model:
+            # The ordering shown was dropped from the cache & doesn't follow the changes anymore
+            self.refresh_fields()
+            return
+        self.contacts_field.row_inserted(ordering.index(name))
+
+    def on_contact_removed(self, name) -> None:
+        ordering = self.book.ordering(self.service.alphabetical_order)
+        if ordering.names is not self.contacts_field.model:
+            self.refresh_fields()
+            return
+        # The name isn't in the ordering anymore; index returns the position it had
+        self.contacts_field.row_deleted(ordering.index(name))
+
+    def on_contact_renamed(self, name, new_name) -> None:
+        self.on_contact_removed(name)
+        self.on_contact_added(new_name)
+
+    def on_contact_updated(self, name) -> None:
+        if self.search_text.get().strip() != '':
+            self.schedule_refresh()
 
     def clear_fields(self) -> None:
-        for field in [self.contacts_field, self.info_field, self.letters_field]:
+        self.contacts_field.set_model([])
+        for field in [self.info_field, self.letters_field]:
             field.delete(0, END)
 
     def refresh_fields(self) -> None:
         self.clear_fields()
-        for contact in self.order_contact():
-            self.contacts_field.insert(END, contact)
+        self.contacts_field.set_model(self.service.visible_names(self.search_text.get()))
+        self.letters_field.insert(END, *self.service.letters())
 
-        for letter in self.alphabetical_order:
-            self.letters_field.insert(END, letter.upper())
+    def schedule_refresh(self, shuffle=False) -> None:
+        """
+        Refreshes the fields once Tk is idle. If a refresh is already pending, it is cancelled &
+            replaced by this one, so that a burst of requests only rebuilds the fields once.
+        :param shuffle: Randomizes the alphabetical order before refreshing if True; kept if a
+            pending refresh asked for it
+        :return: None
+        """
+        self.__pending_shuffle = self.__pending_shuffle or shuffle
+        if self.__pending_refresh is not None:
+            self.after_cancel(self.__pending_refresh)
+        self.__pending_refresh = self.after_idle(self.__run_refresh)
+
+    def __run_refresh(self) -> None:
+        self.__pending_refresh = None
+        if self.__pending_shuffle:
+            self.__pending_shuffle = False
+            self.randomize_alphabetical_order()
+        self.refresh_fields()
 
     def load_contacts(self) -> None:
-        self.randomize_alphabetical_order()
-        with open("project/contacts_pickle", 'rb') as infile:
-            self.contacts_list = pickle.load(infile)
-            self.refresh_fields()
+        self.service.load()
+        self.schedule_refresh(shuffle=True)
 
-    def save_contacts(self) -> None:
-        with open("project/contacts_pickle", 'wb') as outfile:
-            pickle.dump(self.contacts_list, outfile)
+    def on_contacts_loaded(self) -> None:
+        self.import_button['state'] = NORMAL
+        # Until it is built, a search that matches nothing shows nothing instead of freezing
+        self.book.prepare_fuzzy_find()
+        self.schedule_refresh()
 
-    def insert_contact(self, contact) -> None:
-        self.contacts_field.insert(END, contact)
+    def import_file(self) -> None:
+        """
+        Asks for a CSV or vCard file & imports its contacts one batch per Tk callback, so that the
+            window keeps responding; the buttons are disabled until the import is done & the
+            fields are refreshed once at the end. Every batch is saved, so the user is asked first
+            if there are unsaved changes.
+        :return: None
+        """
+        if self.__import is not None:
+            return
+        path = filedialog.askopenfilename(
+            parent=self, filetypes=[("Contacts", "*.csv *.vcf *.vcard"), ("All files", "*")])
+        if not path:
+            return
+        if self.service.has_unsaved_changes() and not messagebox.askokcancel(
+                "Import", "Importing saves the contacts, along with the changes that aren't saved "
+                          "yet. Import anyway?", parent=self):
+            return
+        try:
+            self.__import = self.service.start_import(path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Import", str(error), parent=self)
+            return
+        for button in [self.load, self.import_button, self.save]:
+            button['state'] = DISABLED
+        self.__import_batch()
+
+    def __import_batch(self) -> None:
+        try:
+            more = self.__import.step()
+        except (OSError, ValueError) as error:
+            # The batches already imported are kept & saved
+            self.__finish_import()
+            messagebox.showerror("Import", str(error), parent=self)
+            return
+        if more:
+            self.import_button['text'] = "{} imported".format(self.__import.count)
+            self.after(1, self.__import_batch)
+            return
+        contact_import = self.__import
+        self.__finish_import()
+        message = "Imported {} contacts ({:.0f} records/s)".format(contact_import.count,
+                                                                   contact_import.rate())
+        if len(contact_import.skipped) > 0:
+            message += "\nSkipped {} contacts with the phone numbers or emails of other " \
+                       "contacts".format(len(contact_import.skipped))
+        messagebox.showinfo("Import", message, parent=self)
+
+    def __finish_import(self) -> None:
+        if not self.__import.done:
+            self.service.save()
+        self.__import = None
+        self.import_button['text'] = "Import"
+        for button in [self.load, self.import_button, self.save]:
+            button['state'] = NORMAL
+        self.schedule_refresh()
+
+    def save_contacts(self) -> None:
+        self.service.save()
 
     def show_contact_info(self) -> None:
         """
@@ -258,7 +409,7 @@ class ContactsPage(Frame):
             return
 
         name = self.contacts_field.get(self.contacts_field.curselection()[0])
-        self.current_contact = self.contacts_list[name]
+        self.current_contact = self.service.get(name)
         self.wheel_spin.draw()
 
     def show_winning_info(self, event) -> None:
@@ -267,90 +418,24 @@ class ContactsPage(Frame):
         current contact information that was selected by the spinning wheel.
         :return: None
         """
-        self.randomize_alphabetical_order()
-        self.refresh_fields()
-        winner = self.wheel_spin.winner
-        label = self.wheel_spin.display_label
-        text0 = self.current_contact.name + "'s " + winner.lower() + ':\n'
-        text1 = ''
-
-        if winner == 'Name':
-            text1 = self.current_contact.name
-        elif winner == 'Home Phone Numbers':
-            for elem in self.current_contact.phone_numbers["Home"]:
-                text1 = text1 + elem + ", "
-        elif winner == 'Work Phone Numbers':
-            for elem in self.current_contact.phone_numbers["Work"]:
-                text1 = text1 + elem + ', '
-        elif winner == 'Personal Phone Numbers':
-            for elem in self.current_contact.phone_numbers["Personal"]:
-                text1 = text1 + elem + ', '
-        elif winner == 'Emails':
-            for elem in self.current_contact.email_addresses:
-                text1 = text1 + elem + ', '
-        elif winner == 'Home Addresses':
-            for elem in self.current_contact.addresses:
-                text1 = text1 + elem + ', '
-        elif winner == 'Notes':
-            for elem in self.current_contact.notes:
-                text1 = text1 + elem + ', '
-
-        label['text'] = text0 + text1
+        self.schedule_refresh(shuffle=True)
+        self.wheel_spin.display_label['text'] = self.service.describe(self.current_contact,
+                                                                      self.wheel_spin.winner)
 
     def randomize_alphabetical_order(self):
-        random.shuffle(self.alphabetical_order)
+        self.service.shuffle_order()
 
     def order_contact(self) -> list:
-        """
-        This function takes all the contacts and order them in the order stored in self.alphabetical
-        order
-        :return: The ordered list
-        """
-        i = 0
-        order = self.alphabetical_order
-        contacts = list(self.contacts_list)
-        ordered_list = []
-
-        # We loop until we have all the contact ordered.
-        while i < len(self.contacts_list):
-            current_next_contact = None
-            for contact in contacts:
-                if current_next_contact is None:
-                    current_next_contact = contact
-                    continue
-                # If the first letter is higher in the order than the current next contact, we
-                # change the contact.
-                if order.index(contact[0].lower()) < order.index(current_next_contact[0].lower()):
-                    current_next_contact = contact
-                    continue
-
-                # If the first character is the same, we loop through the other character to find
-                # which on should be
-                # added first.
-                if order.index(contact[0].lower()) == order.index(current_next_contact[0].lower()):
-                    for current_character in range(1, min(len(contact), len(current_next_contact))):
-                        if order.index(contact[current_character].lower()) < \
-                           order.index(current_next_contact[current_character].lower()):
-                            current_next_contact = contact
-                            break
-                        if order.index(contact[current_character].lower()) > \
-                           order.index(current_next_contact[current_character].lower()):
-                            break
-            # we append the contact to the list and remove it from the remaining contact to order.
-            contacts.remove(current_next_contact)
-            ordered_list.append(current_next_contact)
-            i += 1
-        return ordered_list
+        return self.service.order_contact()
 
     def __on_visibility(self, event) -> None:
         """
         This function is called when the user click on the contact tab. It randomizes the
-        alphabetical order
+        alphabetical order; the fields are rebuilt once for all the events of a tab switch
         :param event:
         :return: None
         """
-        self.randomize_alphabetical_order()
-        self.refresh_fields()
+        self.schedule_refresh(shuffle=True)
 
 
 class AddContactPage(Frame):
@@ -363,7 +448,7 @@ class AddContactPage(Frame):
 
     contact_new: Contact class instance that holds the data that the
                 user inputs; when the user submits, the information is
-                stored on the contacts_list in ContactsPage.
+                stored in the controller's ContactBook.
 
     Each contact has 5 attributes:
     - Name
@@ -395,9 +480,10 @@ class AddContactPage(Frame):
 
     === Methods ===
     create: Initializes objects & places them on the page
-    add_contact: Adds contact to the contact_list in ContactsPage;
-                If the contact is new, the name of the contact is added to
-                the contacts Listbox on ContactsPage
+    add_contact: Adds contact to the controller's ContactBook;
+                If the contact is new, the book tells ContactsPage to add
+                its name to the contacts Listbox. Contacts with a phone number
+                or an email of another contact are refused
     clear_all: Loops over all text entries and clears them
     add_name: Changes the new contact's name and updates the preview
     add_phone_num: Adds the phone number to the new contact and updates the preview
@@ -621,46 +707,24 @@ class AddContactPage(Frame):
 
     def refresh_field(self) -> None:
         self.preview.delete(0, END)
-        name = self.contact_new.name
-        home_phone_nums = self.contact_new.phone_numbers["Home"]
-        work_phone_nums = self.contact_new.phone_numbers["Work"]
-        personal_phone_nums = self.contact_new.phone_numbers["Personal"]
-        emails = self.contact_new.email_addresses
-        addresses = self.contact_new.addresses
-        notes = self.contact_new.notes
-        self.preview.delete(0, END)
-        self.preview.insert(END, name)
-        self.preview.insert(END, "")
-        if len(home_phone_nums) or len(work_phone_nums) or len(personal_phone_nums) > 0:
-            self.preview.insert(END, "Phone:")
-            for elem in home_phone_nums:
-                self.preview.insert(END, "   Home: " + elem)
-            for elem in work_phone_nums:
-                self.preview.insert(END, "   Work: " + elem)
-            for elem in personal_phone_nums:
-                self.preview.insert(END, "   Personal: " + elem)
-        if len(emails) > 0:
-            self.preview.insert(END, "Emails:")
-            for elem in emails:
-                self.preview.insert(END, "   " + elem)
-        if len(addresses) > 0:
-            self.preview.insert(END, "Addresses:")
-            for elem in addresses:
-                self.preview.insert(END, "   " + elem)
-        if len(notes) > 0:
-            self.preview.insert(END, "Notes:")
-            for elem in notes:
-                self.preview.insert(END, "   " + elem)
+        self.preview.insert(END, *self.controller.service.preview_lines(self.contact_new))
 
     def add_contact(self) -> None:
-        name = self.contact_new.name
-        contacts_list = self.controller.frames["View Contacts"].contacts_list
-        if name != '':
-            contacts_list[name] = self.contact_new
-        self.controller.frames["View Contacts"].contacts_list = contacts_list
-        self.controller.frames["View Contacts"].clear_fields()
-        for contact in sorted(contacts_list):
-            self.controller.frames["View Contacts"].insert_contact(contact)
+        """
+        Adds the new contact to the book, unless one of its phone numbers or emails belongs to
+            another contact; the duplicates are then listed in the preview
+        :return: None
+        """
+        if self.contact_new.name == '':
+            self.contact_new = Contact('')
+            return
+        duplicates = self.controller.service.add(self.contact_new)
+        if len(duplicates) > 0:
+            self.refresh_field()
+            self.preview.insert(END, "")
+            for kind, value, name in duplicates:
+                self.preview.insert(END, "Already used by " + name + ": " + value)
+            return
         self.contact_new = Contact('')
 
     def clear_all(self) -> None:
@@ -671,7 +735,23 @@ class AddContactPage(Frame):
 
 
 if __name__ == "__main__":
-    create_dictionary()
-    create_contact_list()
-    app = Controller()
+    parser = argparse.ArgumentParser(description="Durable Drills Contact Manager")
+    parser.add_argument('--store', choices=["journal", "sqlite"], default="journal",
+                        help="where the contacts are saved")
+    arguments = parser.parse_args()
+    cached_build(create_dictionary,
+                 ["project/AlphabetGuesser/words.txt",
+                  "project/AlphabetGuesser/create_dictionary.py",
+                  "project/AlphabetGuesser/corpus.py",
+                  "project/AlphabetGuesser/candidate_engine.py"],
+                 ["project/AlphabetGuesser/words_corpus"])
+    # The opening book is built offline with create_opening_book; a stale one is ignored
+    # The sample contacts must never overwrite contacts the user saved, in either store
+    if arguments.store == "sqlite":
+        if not os.path.exists("project/contacts.db"):
+            create_contact_list(destination="project/contacts.db", file_format="sqlite")
+    elif not os.path.exists("project/contacts_pickle") and \
+            not os.path.exists("project/contacts_journal"):
+        create_contact_list()
+    app = Controller(store_type=arguments.store)
     app.mainloop()
@@ -0,0 +1,51 @@
+import hashlib
+import json
+import os
+
+"""
+Build cache for the files the app generates on launch. Each build is fingerprinted with a hash of
+the content of its inputs; the build is only run again when that hash changes or when one of its
+outputs is missing.
+"""
+CACHE_PATH = "project/build_cache.json"
+
+
+def fingerprint(inputs) -> str:
+    """
+    Hashes the path and content of every input file
+    :param inputs: List of paths
+    :return: The hex digest of the hash
+    """
+    digest = hashlib.sha256()
+    for path in inputs:
+        digest.update(path.encode('utf-8') + b'\0')
+        with open(path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def cached_build(build, inputs, outputs, cache_path=CACHE_PATH) -> bool:
+    """
+    Runs build unless it already ran with the exact same inputs and all of its outputs exist
+    :param build: Function taking no arguments that creates the outputs
+    :param inputs: Paths of every file the outputs depend on, including the builder's own source
+    :param outputs: Paths of every file created by build
+    :return: True if build was run, False if the cached outputs were kept
+    """
+    key = build.__module__ + '.' + build.__name__
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path) as infile:
+            cache = json.load(infile)
+
+    current = fingerprint(inputs)
+    if cache.get(key) == current and all(os.path.exists(path) for path in outputs):
+        return False
+
+    build()
+    cache[key] = current
+    with open(cache_path, 'w') as outfile:
+        json.dump(cache, outfile, indent=4, sort_keys=True)
+    return True
@@ -1,10 +1,37 @@
 from typing import List, Dict
 
+PHONE_TYPES = ('Home', 'Work', 'Personal')
+# Shared by every contact that has no value of a kind; replaced by a list when a value is added
+_EMPTY = ()
+
+
+class PhoneNumbers(dict):
+    """
+    Dictionary of phone number type -> list of numbers. Contacts that are loaded only hold the
+    types with numbers; Contact.phone_numbers adds the other types before handing it out, and the
+    list of a missing type is created when it is looked up.
+    """
+    __slots__ = ()
+
+    def __missing__(self, num_type: str) -> List[str]:
+        if num_type not in PHONE_TYPES:
+            raise KeyError(num_type)
+        numbers = self[num_type] = []
+        return numbers
+
 
 class Contact:
     """
     Class for Contacts
 
+    Contacts are kept in __slots__, and their collections are only created once something is
+    added to them (or once they are accessed), so that a contact without emails, addresses, notes
+    or phone numbers holds the shared _EMPTY tuple instead of seven empty lists & a dictionary.
+    phone_numbers is a PhoneNumbers dictionary; it only holds the types with numbers until it is
+    accessed, and then has Home, Work & Personal like before. It is meant for the UI; code that
+    reads or adds numbers uses get_phone_numbers & append_phone_number, which keep it lazy.
+    Contacts are pickled in the same format as before, so old & new pickles can be read by both.
+
     === Public Attributes ===
     name: Name of the contact
     phone_numbers: All phone numbers of the contact
@@ -33,8 +60,14 @@ class Contact:
     change_note: Allows the user to change a note already entered, if the note
                  doesn't exist then nothing is done. If the new_note param is ''
                  then the notes is deleted
+    get_phone_numbers: Returns the phone numbers of one type without creating the collections
+    append_phone_number: Adds a phone number, only creating the list of its type, without printing
+                         it or telling the watcher
+    entries: Iterates over (kind, value) for every phone number, email, address & note
+    watch: Calls a function every time the contact is changed through its methods
 
     """
+    __slots__ = ('name', '_phone_numbers', '_email_addresses', '_addresses', '_notes', '_watcher')
     name: str
     phone_numbers: Dict[str, List[str]]
     email_addresses: List[str]
@@ -43,10 +76,128 @@ class Contact:
 
     def __init__(self, name: str) -> None:
         self.name = name
-        self.phone_numbers = {'Home': [], 'Work': [], 'Personal': []}
-        self.email_addresses = []
-        self.addresses = []
-        self.notes = []
+        self._phone_numbers = _EMPTY
+        self._email_addresses = _EMPTY
+        self._addresses = _EMPTY
+        self._notes = _EMPTY
+        self._watcher = None
+
+    @property
+    def phone_numbers(self) -> Dict[str, List[str]]:
+        if len(self._phone_numbers) < len(PHONE_TYPES):
+            # Every type is listed, as in {'Home': [], 'Work': [], 'Personal': []}, even without
+            # numbers; the lists that are already there are kept
+            phone_numbers = PhoneNumbers((num_type, self.get_phone_numbers(num_type) or [])
+                                         for num_type in PHONE_TYPES)
+            phone_numbers.update(self._phone_numbers)
+            self._phone_numbers = phone_numbers
+        return self._phone_numbers
+
+    @phone_numbers.setter
+    def phone_numbers(self, phone_numbers: Dict[str, List[str]]) -> None:
+        self._phone_numbers = phone_numbers
+
+    @property
+    def email_addresses(self) -> List[str]:
+        if self._email_addresses is _EMPTY:
+            self._email_addresses = []
+        return self._email_addresses
+
+    @email_addresses.setter
+    def email_addresses(self, email_addresses: List[str]) -> None:
+        self._email_addresses = email_addresses
+
+    @property
+    def addresses(self) -> List[str]:
+        if self._addresses is _EMPTY:
+            self._addresses = []
+        return self._addresses
+
+    @addresses.setter
+    def addresses(self, addresses: List[str]) -> None:
+        self._addresses = addresses
+
+    @property
+    def notes(self) -> List[str]:
+        if self._notes is _EMPTY:
+            self._notes = []
+        return self._notes
+
+    @notes.setter
+    def notes(self, notes: List[str]) -> None:
+        self._notes = notes
+
+    def get_phone_numbers(self, num_type: str):
+        """
+        Returns the phone numbers of one type; unlike phone_numbers, reading them doesn't create
+            the collections of a contact that has none
+        :param num_type: Home or Work or Personal
+        :return: The list of numbers, or an empty tuple
+        """
+        return self._phone_numbers.get(num_type, _EMPTY) if self._phone_numbers else _EMPTY
+
+    def append_phone_number(self, num_type: str, number: str) -> None:
+        """
+        Adds a phone number; unlike going through phone_numbers, only the list of its type is
+            created. Used by the code that builds contacts in bulk, e.g. the importers.
+        :param num_type: Home or Work or Personal
+        :param number: The phone number
+        :return: None
+        """
+        if num_type not in PHONE_TYPES:
+            raise KeyError(num_type)
+        if self._phone_numbers is _EMPTY:
+            self._phone_numbers = PhoneNumbers()
+        self._phone_numbers.setdefault(num_type, []).append(number)
+
+    def entries(self):
+        """
+        Iterates over every value of the contact without creating the collections of a contact
+            that has none
+        :return: Iterator of (kind, value), where kind is Home, Work or Personal for phone numbers,
+            Email, Physical or Note
+        """
+        for num_type in PHONE_TYPES:
+            for number in self.get_phone_numbers(num_type):
+                yield num_type, number
+        for kind, values in [('Email', self._email_addresses), ('Physical', self._addresses),
+                             ('Note', self._notes)]:
+            for value in values:
+                yield kind, value
+
+    def watch(self, watcher) -> None:
+        """
+        Sets the function called every time the contact is changed through its methods; the
+            watcher isn't pickled
+        :param watcher: Function called with (contact, kind, old value, new value), where kind is
+            Name or one of the kinds of entries; old or new is None when a value is added or
+            removed. None stops watching.
+        :return: None
+        """
+        self._watcher = watcher
+
+    def __changed(self, kind: str, old, new) -> None:
+        if self._watcher is not None:
+            self._watcher(self, kind, old, new)
+
+    def __getstate__(self) -> dict:
+        # Same state as the __dict__ of the contacts pickled before __slots__ were used
+        return {'name': self.name,
+                'phone_numbers': {num_type: list(self.get_phone_numbers(num_type))
+                                  for num_type in PHONE_TYPES},
+                'email_addresses': list(self._email_addresses),
+                'addresses': list(self._addresses),
+                'notes': list(self._notes)}
+
+    def __setstate__(self, state: dict) -> None:
+        self.name = state['name']
+        self._watcher = None
+        self._phone_numbers = PhoneNumbers((num_type, numbers) for num_type, numbers
+                                           in (state.get('phone_numbers') or {}).items()
+                                           if len(numbers) > 0) or _EMPTY
+        self._email_addresses = state.get('email_addresses') or _EMPTY
+        self._addresses = state.get('addresses') or _EMPTY
+        self._notes = state.get('notes') or _EMPTY
 
     def change_name(self, new_name: str) -> None:
         """
@@ -55,7 +206,8 @@ class Contact:
         :return: None
         """
         print("DEBUG: Set Name To:", new_name)
-        self.name = new_name
+        old_name, self.name = self.name, new_name
+        self.__changed('Name', old_name, new_name)
 
     def add_phone_number(self, num_type: str, number: str) -> None:
         """
@@ -68,7 +220,8 @@ class Contact:
         if num_type in ['Home', 'Work', 'Personal']:
             print("DEBUG: Phone Number:", number)
             print("DEBUG: Num_type:", num_type)
-            self.phone_numbers[num_type].append(number)
+            self.append_phone_number(num_type, number)
+            self.__changed(num_type, None, number)
 
     def change_phone_number(self, orig_num: str, new_num: str) -> None:
         """
@@ -77,20 +230,15 @@ class Contact:
         :param new_num: The number to be changed to
         :return: None
         """
-        if orig_num in self.phone_numbers['Home']:
-            self.phone_numbers['Home'].remove(orig_num)
-            if new_num != '':
-                self.phone_numbers['Home'].append(new_num)
-
-        elif orig_num in self.phone_numbers['Work']:
-            self.phone_numbers['Work'].remove(orig_num)
-            if new_num != '':
-                self.phone_numbers['Work'].append(new_num)
-
-        elif orig_num in self.phone_numbers['Personal']:
-            self.phone_numbers['Personal'].remove(orig_num)
-            if new_num != '':
-                self.phone_numbers['Personal'].append(new_num)
+        for num_type in PHONE_TYPES:
+            numbers = self.get_phone_numbers(num_type)
+            if orig_num in numbers:
+                # The number was found, so numbers is the list of the contact, not _EMPTY
+                numbers.remove(orig_num)
+                if new_num != '':
+                    numbers.append(new_num)
+                self.__changed(num_type, orig_num, new_num or None)
+                break
 
     def add_address(self, address_type: str, address: str) -> None:
         """
@@ -102,9 +250,11 @@ class Contact:
         """
         if address_type == 'Physical':
             self.addresses.append(address)
+            self.__changed('Physical', None, address)
 
         elif address_type == 'Email':
             self.email_addresses.append(address)
+            self.__changed('Email', None, address)
 
     def change_email_address(self, orig_add: str, new_add: str) -> None:
         """
@@ -113,10 +263,11 @@ class Contact:
         :param new_add: The email address to be changed to
         :return: None
         """
-        if orig_add in self.email_addresses:
+        if orig_add in self._email_addresses:
             self.email_addresses.remove(orig_add)
             if new_add != '':
                 self.email_addresses.append(new_add)
+            self.__changed('Email', orig_add, new_add or None)
 
     def change_address(self, orig_add: str, new_add: str) -> None:
         """
@@ -125,10 +276,11 @@ class Contact:
         :param new_add: The address to be changed to
         :return: None
         """
-        if orig_add in self.addresses:
+        if orig_add in self._addresses:
             self.addresses.remove(orig_add)
             if new_add != '':
                 self.addresses.append(new_add)
+            self.__changed('Physical', orig_add, new_add or None)
 
     def add_note(self, note: str) -> None:
         """
@@ -137,6 +289,7 @@ class Contact:
         :return: None
         """
         self.notes.append(note)
+        self.__changed('Note', None, note)
 
     def change_note(self, orig_note: str, new_note: str) -> None:
         """
@@ -145,18 +298,20 @@ class Contact:
         :param new_note: The note to be changed to
         :return: None
         """
-        if orig_note in self.notes:
+        if orig_note in self._notes:
             self.notes.remove(orig_note)
             if new_note != '':
                 self.notes.append(new_note)
+            self.__changed('Note', orig_note, new_note or None)
 
     def __str__(self):
         text_to_print = "Contact: \nName: " + str(self.name) + "\n"
-        text_to_print += "Work phone number: " + str(self.phone_numbers["Work"]) + "\n"
-        text_to_print += "Home phone number: " + str(self.phone_numbers["Home"]) + "\n"
-        text_to_print += "Personal phone number: " + str(self.phone_numbers["Personal"]) + "\n"
-        text_to_print += "Email address: " + str(self.email_addresses) + "\n"
-        text_to_print += "Home address: " + str(self.addresses) + "\n"
-        text_to_print += "Notes: " + str(self.notes) + "\n"
+        text_to_print += "Work phone number: " + str(list(self.get_phone_numbers("Work"))) + "\n"
+        text_to_print += "Home phone number: " + str(list(self.get_phone_numbers("Home"))) + "\n"
+        text_to_print += "Personal phone number: " + \
+            str(list(self.get_phone_numbers("Personal"))) + "\n"
+        text_to_print += "Email address: " + str(list(self._email_addresses)) + "\n"
+        text_to_print += "Home address: " + str(list(self._addresses)) + "\n"
+        text_to_print += "Notes: " + str(list(self._notes)) + "\n"
 
         return text_to_print
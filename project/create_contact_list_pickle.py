@@ -1,11 +1,44 @@
-from project.contact import Contact
-from random import randint
+import argparse
 import pickle
+from math import gcd
+from random import randint
+import numpy as np
+from project.contact import Contact
+from project.ContactBook.contact_export import WRITERS, BUFFER_SIZE
+from project.ContactBook.sqlite_store import SQLiteStore
 """
-This script generates a list of 40 pre-made contacts for use in the main app.
-The names are pre-made, but the phone numbers are random and some info is
-intentionally missing from contacts (as it often is in real life)
+This script generates contacts for use in the main app. By default it makes 40 pre-made contacts;
+it can also make any number of contacts for load testing, named after the pre-made names. Phone
+numbers, addresses, emails & notes are random, and some info is intentionally missing from
+contacts (as it often is in real life). The same seed always gives the same contacts.
 """
+NAME_LIST = ["Ray Allen", "Clarence Boisvert", "Katherina Burpee", "Nevada Dominguez",
+             "Xochitl Olivas", "Rubi Branscome", "Emely Ackley", "Etta Holton", "Pearl Addario",
+             "Kimi Pelosi", "Vernita Pennel", "Reyes Buhl", "Jovan Selle", "Rene Nicks",
+             "Tonia Perrault", "Michel Guzman", "William Sirois", "Carline Whitesell",
+             "Luella Rustin", "Jewell Wakefield", "Sanora Hamdan", "Idalia Hosmer",
+             "Dorethea Wommack", "Joanne Huth", "Wayne Sippel", "Arden Lopinto",
+             "Teena Formica", "Mary Zorn", "Young Gain", "Cayla Pohlmann", "Lea Fogg",
+             "Mack Millhouse", "Lucio Likes", "Meggan Page", "Neda Plasencia", "Anissa Venturi",
+             "Berry Furrow", "Rachell Doss", "Charlott Bledsoe", "Luann Goodman"]
+# Without repeats, so that every pair of a first & a last name makes a different name
+FIRST_NAMES = list(dict.fromkeys(name.split()[0] for name in NAME_LIST))
+# The pre-made last names, followed by last names made of two syllables
+_SYLLABLES = ["Bel", "Cor", "Dun", "Fair", "Gar", "Hal", "Kings", "Lan", "Mar", "Nor", "Pem", "Ros",
+              "Stan", "Thorn", "Wes", "Yar"]
+_ENDINGS = ["ley", "ton", "wood", "ford", "field", "by", "more", "worth", "dale", "croft", "well",
+            "ham", "wick", "stead", "brook", "ridge"]
+LAST_NAMES = list(dict.fromkeys([name.split()[1] for name in NAME_LIST] +
+                                [syllable + ending for syllable in _SYLLABLES
+                                 for ending in _ENDINGS]))
+STREET_NAMES = ["Main Street", "River Road", "Oak Street", "Campbell Avenue",
+                "Elizabeth II Street", "North Road", "Charles Avenue", "Wellington Street",
+                "Nelson Street", "Hill Road", "Thompson Avenue"]
+DOMAINS = ["hotmail.com", "gmail.com", "hotmail.fr", "outlook.com", "yahoo.com"]
+NOTES = ["Cool dude!", "I don't trust this guy", "Main developer at Google!", "Nice gal",
+         "Rude person", "BFF"]
+CHUNK_SIZE = 100_000
+_PREMADE = set(NAME_LIST)
 
 
 def generate_random_phone_number() -> str:
@@ -13,101 +46,194 @@ def generate_random_phone_number() -> str:
     Function generates a random phone number.
     :return: Random numbers in the format ###-###-####.
     """
-    phone_number = ""
-    i = 0
-    while i < 10:
-        if i == 0:
-            number_to_add = randint(1, 9)
-            phone_number = phone_number + str(number_to_add)
-            i += 1
-            continue
-        if i == 2:
-            number_to_add = randint(0, 9)
-            phone_number = phone_number + str(number_to_add) + "-"
-            i += 1
-            continue
-        if i == 5:
-            number_to_add = randint(0, 9)
-            phone_number = phone_number + str(number_to_add) + "-"
-            i += 1
-            continue
-        number_to_add = randint(0, 9)
-        phone_number = phone_number + str(number_to_add)
-        i += 1
-
-    return phone_number
+    return "{:03d}-{:03d}-{:04d}".format(randint(100, 999), randint(0, 999), randint(0, 9999))
 
 
 def generate_random_address() -> str:
     """
     Function generate a random address with the list of street name below.
-    :return: A number from 1 to 999 followed by one of the street name in the street_name variable.
+    :return: A number from 1 to 999 followed by one of the street names of STREET_NAMES.
     """
-    street_name = ["Main Street", "River Road", "Oak Street",
-                   "Campbell Avenue", "Elizabeth II Street", "North Road",
-                   "Charles Avenue", "Wellington Street", "Nelson Street",
-                   "Hill Road", "Thompson Avenue"]
     number = randint(1, 999)
-    street_name = street_name[randint(0, len(street_name)-1)]
+    street_name = STREET_NAMES[randint(0, len(STREET_NAMES)-1)]
     return str(number) + " " + street_name
 
 
 def generate_email_address(input_name: str) -> str:
     """
     Function takes a name and generate an email address by replace all space in the name with dot.
-    It uses one of the domain name in the domain variable randomly.
+    It uses one of the domain names of DOMAINS randomly.
     :param input_name: The name of the person we want to generate an email address for.
     :return: The email address that was generated.
     """
-    domain = ["hotmail.com", "gmail.com", "hotmail.fr", "outlook.com", "yahoo.com"]
     input_name = input_name.replace(" ", ".")
-    return input_name.lower() + "@" + domain[randint(0, len(domain)-1)]
+    return input_name.lower() + "@" + DOMAINS[randint(0, len(DOMAINS)-1)]
 
 
 def generate_note() -> str:
-    note_list = ["Cool dude!", "I don't trust this guy", "Main developer at Google!", "Nice gal",
-                 "Rude person", "BFF"]
-    return note_list[randint(0, len(note_list) - 1)]
-
-
-def main():
-    name_list = ["Ray Allen", "Clarence Boisvert", "Katherina Burpee", "Nevada Dominguez",
-                 "Xochitl Olivas", "Rubi Branscome", "Emely Ackley", "Etta Holton", "Pearl Addario",
-                 "Kimi Pelosi", "Vernita Pennel", "Reyes Buhl", "Jovan Selle", "Rene Nicks",
-                 "Tonia Perrault", "Michel Guzman", "William Sirois", "Carline Whitesell",
-                 "Luella Rustin", "Jewell Wakefield", "Sanora Hamdan", "Idalia Hosmer",
-                 "Dorethea Wommack", "Joanne Huth", "Wayne Sippel", "Arden Lopinto",
-                 "Teena Formica", "Mary Zorn", "Young Gain", "Cayla Pohlmann", "Lea Fogg",
-                 "Mack Millhouse", "Lucio Likes", "Meggan Page", "Neda Plasencia", "Anissa Venturi",
-                 "Berry Furrow", "Rachell Doss", "Charlott Bledsoe", "Luann Goodman"]
-
-    contact_dictionary = {}
-    for name in name_list:
-        contact = Contact(name)
-        # For each contact, we randomly decide if we add each of the attributes.
-        if randint(0, 1):
-            contact.add_address("Physical", generate_random_address())
-        if randint(0, 1):
-            contact.add_address("Email", generate_email_address(contact.name))
-        if randint(0, 1):
-            contact.add_phone_number("Home", generate_random_phone_number())
-        if randint(0, 1):
-            contact.add_phone_number("Work", generate_random_phone_number())
-        if randint(0, 1):
-            contact.add_phone_number("Personal", generate_random_phone_number())
-        if randint(0, 1):
-            contact.add_note(generate_note())
-
-        contact_dictionary[name] = contact
-
-    # Saving the dictionary on the output pickle.
-    with open("project/contacts_pickle", 'wb') as outfile:
-        pickle.dump(contact_dictionary, outfile)
-    # Loading the dictionary to see if it worked.
-    with open("project/contacts_pickle", 'rb') as infile:
-        test = pickle.load(infile)
-        print(test["Ray Allen"])
+    return NOTES[randint(0, len(NOTES) - 1)]
+
+
+def _digits(values: np.ndarray, width: int) -> np.ndarray:
+    """
+    Returns the ASCII digits of integers, padded with zeros
+    :param values: Array of non-negative integers
+    :param width: Number of digits
+    :return: Array of shape (len(values), width) of uint8 ASCII codes
+    """
+    powers = 10 ** np.arange(width - 1, -1, -1)
+    return (values[:, None] // powers % 10 + ord('0')).astype(np.uint8)
+
+
+def generate_phone_numbers(rng: np.random.Generator, count: int) -> list:
+    """
+    Generates random phone numbers all at once
+    :param rng: The numpy random generator
+    :param count: Number of phone numbers
+    :return: List of phone numbers in the format ###-###-####
+    """
+    characters = np.full((count, 12), ord('-'), dtype=np.uint8)
+    characters[:, 0:3] = _digits(rng.integers(100, 1000, count), 3)
+    characters[:, 4:7] = _digits(rng.integers(0, 1000, count), 3)
+    characters[:, 8:12] = _digits(rng.integers(0, 10000, count), 4)
+    return characters.view('S12').ravel().astype('U12').tolist()
+
+
+def generate_names(start: int, count: int, seed: int) -> list:
+    """
+    Generates unique names; the first names are those of NAME_LIST, then every pair of a first &
+        a last name in an order shuffled by the seed, then the same pairs followed by 2, 3, ...
+    :param start: Index of the first name
+    :param count: Number of names
+    :param seed: The seed
+    :return: List of names
+    """
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    # i -> (multiplier * i + offset) % pairs visits every pair once, without storing a permutation
+    rng = np.random.default_rng([seed, 0])
+    multiplier = int(rng.integers(1, pairs))
+    while gcd(multiplier, pairs) != 1:
+        multiplier = int(rng.integers(1, pairs))
+    offset = int(rng.integers(0, pairs))
+
+    names = NAME_LIST[start:start + count]
+    indices = np.arange(max(start, len(NAME_LIST)), start + count, dtype=np.int64) - len(NAME_LIST)
+    pair_indices = (indices % pairs * multiplier + offset) % pairs
+    rounds = indices // pairs
+    for pair, round_number in zip(pair_indices.tolist(), rounds.tolist()):
+        first, last = FIRST_NAMES[pair % len(FIRST_NAMES)], LAST_NAMES[pair // len(FIRST_NAMES)]
+        name = first + ' ' + last
+        # The names of NAME_LIST are already used without a number
+        number = round_number + (2 if name in _PREMADE else 1)
+        names.append(name if number == 1 else name + ' ' + str(number))
+    return names
+
+
+def generate_contacts(count: int, seed=0):
+    """
+    Generates contacts CHUNK_SIZE at a time, with every random field of a chunk generated at once;
+        each field is added half of the time
+    :param count: Number of contacts
+    :param seed: The seed; the same seed & count always give the same contacts
+    :return: Generator of Contacts
+    """
+    streets = np.array(STREET_NAMES)
+    for chunk, start in enumerate(range(0, count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, count - start)
+        # Every chunk has its own generator, so chunks don't depend on the previous ones
+        rng = np.random.default_rng([seed, 1, chunk])
+        names = generate_names(start, size, seed)
+        present = rng.random((size, 6)) < 0.5
+        addresses = np.char.add(np.char.add(rng.integers(1, 1000, size).astype('U3'), ' '),
+                                streets[rng.integers(0, len(STREET_NAMES), size)]).tolist()
+        domains = rng.integers(0, len(DOMAINS), size).tolist()
+        phone_numbers = [generate_phone_numbers(rng, size) for _ in range(3)]
+        notes = rng.integers(0, len(NOTES), size).tolist()
+
+        for i, row in enumerate(present.tolist()):
+            contact = Contact(names[i])
+            if row[0]:
+                contact.addresses = [addresses[i]]
+            if row[1]:
+                contact.email_addresses = [names[i].replace(" ", ".").lower() + "@" +
+                                           DOMAINS[domains[i]]]
+            for num_type, numbers, is_present in zip(['Home', 'Work', 'Personal'], phone_numbers,
+                                                     row[2:5]):
+                if is_present:
+                    contact.append_phone_number(num_type, numbers[i])
+            if row[5]:
+                contact.notes = [NOTES[notes[i]]]
+            yield contact
+
+
+FORMATS = ['pickle', 'journal', 'sqlite', 'vcard', 'csv', 'jsonl']
+
+
+def write_contacts(contacts, destination: str, file_format="pickle") -> int:
+    """
+    Writes contacts as they are generated
+    :param contacts: Iterable of Contacts
+    :param destination: Path of the file to write
+    :param file_format: One of FORMATS:
+        pickle: {name: Contact, ...}, like contacts_pickle; the contacts are all held in memory
+        journal: The journal of a JournalStore, streamed one entry at a time
+        sqlite: The database of a SQLiteStore, committed every CHUNK_SIZE contacts
+        vcard, csv, jsonl: The files written by contact_export
+    :return: Number of contacts written
+    """
+    if file_format == 'pickle':
+        contact_dictionary = {contact.name: contact for contact in contacts}
+        with open(destination, 'wb') as outfile:
+            pickle.dump(contact_dictionary, outfile)
+        return len(contact_dictionary)
+
+    count = 0
+    if file_format == 'journal':
+        with open(destination, 'wb', buffering=BUFFER_SIZE) as outfile:
+            for contact in contacts:
+                pickle.dump(('add', contact.name, contact), outfile)
+                count += 1
+    elif file_format == 'sqlite':
+        store = SQLiteStore(destination)
+        for contact in contacts:
+            store.add(contact)
+            count += 1
+            if count % CHUNK_SIZE == 0:
+                store.save()
+        store.save()
+        store.close()
+    else:
+        with open(destination, 'w', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as outfile:
+            count = WRITERS[file_format](contacts, outfile)
+    return count
+
+
+def main(count=len(NAME_LIST), destination="project/contacts_pickle", file_format="pickle",
+         seed=None):
+    """
+    Generates contacts & writes them
+    :param count: Number of contacts; the default is one contact for each name of NAME_LIST
+    :param destination: Path of the file to write
+    :param file_format: One of FORMATS
+    :param seed: The seed; a random one if None
+    :return: None
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    write_contacts(generate_contacts(count, seed), destination, file_format)
+
+    if file_format == 'pickle' and count <= len(NAME_LIST):
+        # Loading the dictionary to see if it worked.
+        with open(destination, 'rb') as infile:
+            test = pickle.load(infile)
+            print(test["Ray Allen"])
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Generates random contacts")
+    parser.add_argument('destination', nargs='?', default="project/contacts_pickle")
+    parser.add_argument('--count', type=int, default=len(NAME_LIST))
+    parser.add_argument('--format', choices=FORMATS, default="pickle")
+    parser.add_argument('--seed', type=int, default=None)
+    arguments = parser.parse_args()
+    main(arguments.count, arguments.destination, arguments.format, arguments.seed)